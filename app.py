@@ -1,23 +1,31 @@
 import cv2
 import os
 import uuid
+import time
+import threading
+import mimetypes
 import numpy as np
 import config
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
-from engine.visuals import VisualEngine
-from engine.pose import PoseEngine
-from engine.data import DataCollector
-from engine.audio import AudioEngine
+from urllib.parse import quote
+# Imported eagerly: its shared job table must exist before gunicorn forks
+from engine import admission
+from engine.media import probe_video
+from engine.samples import SampleCatalog
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['OUTPUT_FOLDER'] = 'outputs'
+# Absolute, since send_file resolves relative paths against the app root
+# rather than the working directory the files are written to
+app.config['UPLOAD_FOLDER'] = os.path.abspath('uploads')
+app.config['OUTPUT_FOLDER'] = os.path.abspath('outputs')
 
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 
+sample_catalog = SampleCatalog()
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
@@ -28,6 +36,14 @@ def not_found(error):
         return jsonify({'error': 'Not found'}), 404
     return error
 
+def preload():
+    """Warm imports and the pose model without building MediaPipe graphs (fork-safe)"""
+    from engine import visuals, pose, data, audio  # noqa: F401
+    if os.path.exists(config.POSE_MODEL_PATH):
+        pose.load_model_buffer()
+    audio.get_ffmpeg_exe()
+    import librosa, scipy.ndimage, scipy.signal  # noqa: F401
+
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
 
 def allowed_file(filename):
@@ -63,10 +79,17 @@ def trim_video_to_duration(video_path, max_duration, output_path):
     out.release()
     return output_path
 
-def process_video(video_path, output_id, max_duration=None):
+def process_video(video_path, output_id, max_duration=None, all_modes=False):
     if not os.path.exists(config.POSE_MODEL_PATH):
         raise FileNotFoundError(f"Pose model not found: {config.POSE_MODEL_PATH}. Please ensure pose_landmarker_full.task is in the project root.")
     
+    # Engines are imported per job so the app starts fast; MediaPipe graphs are
+    # only ever built here, inside a worker, never in a preloading master.
+    from engine.visuals import VisualEngine, analysis_step, fit_size
+    from engine.pose import PoseEngine
+    from engine.data import DataCollector
+    from engine.audio import AudioEngine
+
     # Trim video if max_duration is specified
     original_path = video_path
     temp_trimmed_path = None
@@ -86,74 +109,112 @@ def process_video(video_path, output_id, max_duration=None):
         raise ValueError("Could not open video file")
     
     detected_fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = detected_fps if 0 < detected_fps <= 120 else 30.0
     
-    if detected_fps <= 0 or detected_fps > 120:
-        fps = 30.0
-        use_processed_frame_count = True
-    else:
-        fps = detected_fps
-        if frame_count > 0 and fps > 0:
-            use_processed_frame_count = False
-        else:
-            use_processed_frame_count = True
+    # High-fps input is analysed on every step-th frame; the others are only
+    # grabbed, never decoded. Writing at fps / step holds each rendered frame
+    # for the frames it stands in for, so timing is unchanged.
+    step = analysis_step(fps)
     
-    delay_time = int(1000 / fps)
+    # Output keeps the source aspect; analysis runs on a smaller copy
+    src_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    if not all(src_size):
+        src_size = (config.WIDTH, config.HEIGHT)
     
     temp_video_path = os.path.join(app.config['OUTPUT_FOLDER'], f"temp_{output_id}.avi")
-    write_fps = fps
+    write_fps = fps / step
     writer = cv2.VideoWriter(
         temp_video_path,
         cv2.VideoWriter_fourcc(*'MJPG'),
         write_fps,
-        (config.WIDTH, config.HEIGHT)
+        fit_size(*src_size, config.WIDTH, config.HEIGHT)
     )
     
-    visuals = VisualEngine()
-    pose_tracker = PoseEngine()
     collector = DataCollector()
     audio_synth = AudioEngine()
     show_skeleton = config.SHOW_SKELETON
     
-    frame_idx = 0
-    fps_inv = 1.0 / fps
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        visual_frame, flow_mag, c_ang, c_mag, cx, cy = visuals.process(frame, mirror_mode=False)
-        
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        pose_result = pose_tracker.process(rgb, frame_idx * fps_inv * 1000.0)
+    if config.PARALLEL_ANALYSIS:
+        # Decode, visuals and pose in separate processes over a shared ring
+        from engine.pipeline import analyse_video
+        cap.release()
+        try:
+            frame_idx = analyse_video(video_path, fps, step, src_size, collector, writer, show_skeleton)
+        finally:
+            writer.release()
+    else:
+        visuals = VisualEngine(frame_step=step, frame_size=src_size)
+        pose_tracker = PoseEngine()
         
-        collector.process(flow_mag, c_ang, c_mag, cx, cy, pose_result)
+        frame_idx = 0
+        src_idx = 0
+        fps_inv = 1.0 / fps
         
-        final_output = pose_tracker.draw_overlay(visual_frame, pose_result) if show_skeleton else visual_frame
+        while True:
+            if src_idx % step:
+                if not cap.grab():
+                    break
+                src_idx += 1
+                continue
+            
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            visual_frame, flow_mag, c_ang, c_mag, cx, cy = visuals.process(frame, mirror_mode=False)
+            
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            pose_result = pose_tracker.process(rgb, src_idx * fps_inv * 1000.0)
+            
+            collector.process(flow_mag, c_ang, c_mag, cx, cy, pose_result)
+            
+            final_output = pose_tracker.draw_overlay(visual_frame, pose_result) if show_skeleton else visual_frame
+            
+            writer.write(final_output)
+            frame_idx += 1
+            src_idx += 1
         
-        writer.write(final_output)
-        frame_idx += 1
-    
-    cap.release()
-    writer.release()
+        cap.release()
+        writer.release()
     
     if not collector.spectral_hist:
         raise ValueError("No motion data collected")
     
-    if use_processed_frame_count:
-        total_duration = frame_idx * fps_inv
-    else:
-        total_duration = frame_count / fps if frame_count > 0 else frame_idx * fps_inv
-    
-    wav_path = os.path.join(app.config['OUTPUT_FOLDER'], f"temp_{output_id}.wav")
-    audio_synth.generate(collector, total_duration)
+    # Audio is synthesized to the length of the frames actually written.
+    total_duration = frame_idx / write_fps
     
-    if os.path.exists("temp_audio.wav"):
-        os.rename("temp_audio.wav", wav_path)
+    try:
+        return render_outputs(audio_synth, collector, temp_video_path, output_id, total_duration, all_modes)
+    finally:
+        # Clean up trimmed video if it was created
+        if temp_trimmed_path and os.path.exists(temp_trimmed_path):
+            try:
+                os.remove(temp_trimmed_path)
+            except:
+                pass
+
+def mode_track_path(output_id, mode):
+    return os.path.join(app.config['OUTPUT_FOLDER'], f"mode_{output_id}_{mode}.wav")
+
+def mode_tracks(output_id):
+    from engine.audio import MODES
+    return {
+        mode: f"/mode_audio/{output_id}/{mode}"
+        for mode in MODES if os.path.exists(mode_track_path(output_id, mode))
+    }
+
+def render_outputs(audio_synth, collector, temp_video_path, output_id, total_duration, all_modes=False):
+    if all_modes:
+        # Every mode shares one reconstruction; the classified one is muxed
+        # and all of them are kept as separate tracks for auditioning.
+        _, audio = audio_synth.generate_all_modes(
+            collector, total_duration, lambda mode: mode_track_path(output_id, mode)
+        )
+    else:
+        audio, _ = audio_synth.generate(collector, total_duration)
     
     output_filename = os.path.join(app.config['OUTPUT_FOLDER'], f"final_{output_id}.mp4")
-    audio_synth.merge_video(temp_video_path, wav_path, output_filename, total_duration)
+    audio_synth.merge_video(temp_video_path, audio, output_filename, total_duration)
     
     spectrogram_path = os.path.join(app.config['OUTPUT_FOLDER'], f"spectrogram_{output_id}.png")
     audio_synth.save_spectrogram(spectrogram_path)
@@ -165,10 +226,6 @@ def process_video(video_path, output_id, max_duration=None):
     
     try:
         os.remove(temp_video_path)
-        os.remove(wav_path)
-        # Clean up trimmed video if it was created
-        if temp_trimmed_path and os.path.exists(temp_trimmed_path):
-            os.remove(temp_trimmed_path)
     except:
         pass
     
@@ -180,23 +237,34 @@ def index():
 
 @app.route('/healthz')
 def health():
-    return jsonify({'status': 'ok'}), 200
+    with live_lock:
+        n_live = len(live_sessions)
+    return jsonify({'status': 'ok', 'load': admission.load(), 'live_sessions': n_live}), 200
+
+def overloaded_response(e):
+    if e.retry_after is None:
+        return jsonify({'error': str(e)}), 413
+    return jsonify({'error': str(e), 'retry_after': e.retry_after}), 503, {'Retry-After': str(e.retry_after)}
 
 @app.route('/samples')
 def list_samples():
-    samples_dir = 'Samples'
-    if not os.path.exists(samples_dir):
-        return jsonify({'samples': []})
-    
     samples = []
-    for filename in os.listdir(samples_dir):
-        if filename.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.webm')):
-            samples.append({
-                'filename': filename,
-                'name': filename.replace('.mp4', '').replace('.avi', '').replace('.mov', '').replace('.mkv', '').replace('.webm', '')
-            })
-    
-    return jsonify({'samples': samples})
+    for entry in sample_catalog.list():
+        name = quote(entry['filename'])
+        samples.append({
+            'filename': entry['filename'],
+            'name': entry['name'],
+            'duration': entry['duration'],
+            'width': entry['width'],
+            'height': entry['height'],
+            'thumbnail_url': f"/sample_thumbnail/{name}?v={entry['key']}",
+            'preview_url': f"/sample_preview/{name}?v={entry['key']}"
+        })
+    
+    response = jsonify({'samples': samples})
+    response.set_etag(sample_catalog.version)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/process_sample', methods=['POST'])
 def process_sample():
@@ -204,30 +272,26 @@ def process_sample():
     if not data or 'filename' not in data:
         return jsonify({'error': 'No filename provided'}), 400
     
-    filename = data['filename']
-    filepath = os.path.join('Samples', filename)
+    entry = sample_catalog.get(data['filename'])
+    all_modes = bool(data.get('all_modes', False))
     
-    if not os.path.exists(filepath):
+    if entry is None or not os.path.exists(entry['path']):
         return jsonify({'error': 'Sample file not found'}), 404
+    filepath = entry['path']
     
     output_id = str(uuid.uuid4())
     
     # Always use local max duration (no web trimming)
     max_duration = config.MAX_VIDEO_DURATION_LOCAL
     
-    # Check video duration before processing
-    cap_check = cv2.VideoCapture(filepath)
-    if cap_check.isOpened():
-        fps_check = cap_check.get(cv2.CAP_PROP_FPS) or 30.0
-        frame_count_check = int(cap_check.get(cv2.CAP_PROP_FRAME_COUNT))
-        video_duration = frame_count_check / fps_check if frame_count_check > 0 and fps_check > 0 else 0
-        cap_check.release()
-        will_trim = max_duration is not None and video_duration > max_duration
-    else:
-        will_trim = False
-    
     try:
-        output_path, spectrogram_path = process_video(filepath, output_id, max_duration=max_duration)
+        # Probe once for both the trim notice and the job's cost estimate
+        probe = probe_video(filepath)
+        will_trim = max_duration is not None and probe['duration'] > max_duration
+        if will_trim:
+            probe['duration'] = max_duration
+        with admission.admit(admission.estimate_cost(probe, all_modes)):
+            output_path, spectrogram_path = process_video(filepath, output_id, max_duration=max_duration, all_modes=all_modes)
         
         response_data = {
             'success': True,
@@ -236,10 +300,15 @@ def process_sample():
             'spectrogram_filename': os.path.basename(spectrogram_path)
         }
         
+        if all_modes:
+            response_data['modes'] = mode_tracks(output_id)
+        
         if will_trim:
             response_data['message'] = f'Video was trimmed to {max_duration} seconds for web processing. For full-length processing, run locally.'
         
         return jsonify(response_data)
+    except admission.Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
         error_msg = str(e)
         if 'timeout' in error_msg.lower() or 'memory' in error_msg.lower():
@@ -260,25 +329,21 @@ def upload_file():
     
     output_id = str(uuid.uuid4())
     filename = secure_filename(file.filename)
+    all_modes = request.form.get('all_modes', '').lower() in ('1', 'true', 'yes')
     filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{output_id}_{filename}")
     file.save(filepath)
     
     # Always use local max duration (no web trimming)
     max_duration = config.MAX_VIDEO_DURATION_LOCAL
     
-    # Check video duration before processing
-    cap_check = cv2.VideoCapture(filepath)
-    if cap_check.isOpened():
-        fps_check = cap_check.get(cv2.CAP_PROP_FPS) or 30.0
-        frame_count_check = int(cap_check.get(cv2.CAP_PROP_FRAME_COUNT))
-        video_duration = frame_count_check / fps_check if frame_count_check > 0 and fps_check > 0 else 0
-        cap_check.release()
-        will_trim = max_duration is not None and video_duration > max_duration
-    else:
-        will_trim = False
-    
     try:
-        output_path, spectrogram_path = process_video(filepath, output_id, max_duration=max_duration)
+        # Probe once for both the trim notice and the job's cost estimate
+        probe = probe_video(filepath)
+        will_trim = max_duration is not None and probe['duration'] > max_duration
+        if will_trim:
+            probe['duration'] = max_duration
+        with admission.admit(admission.estimate_cost(probe, all_modes)):
+            output_path, spectrogram_path = process_video(filepath, output_id, max_duration=max_duration, all_modes=all_modes)
         
         try:
             os.remove(filepath)
@@ -292,6 +357,9 @@ def upload_file():
             'spectrogram_filename': os.path.basename(spectrogram_path)
         }
         
+        if all_modes:
+            response_data['modes'] = mode_tracks(output_id)
+        
         if will_trim:
             response_data['message'] = f'Video was trimmed to {max_duration} seconds for web processing. For full-length processing, run locally.'
         
@@ -301,11 +369,179 @@ def upload_file():
             os.remove(filepath)
         except:
             pass
+        if isinstance(e, admission.Overloaded):
+            return overloaded_response(e)
         error_msg = str(e)
         if 'timeout' in error_msg.lower() or 'memory' in error_msg.lower():
             error_msg += ' (Note: Video processing requires significant resources. The free tier may have limitations. Try a shorter/smaller video.)'
         return jsonify({'error': error_msg}), 500
 
+# Live ingest: a client opens a session, POSTs JPEG frames with timestamps on
+# a kept-alive connection, watches the overlay on /live/<id>/stream and
+# finally stops the session to render the performance like an upload.
+live_sessions = {}
+live_pending = 0  # starts that hold a slot while their session is built
+live_lock = threading.Lock()
+
+def reap_live_sessions():
+    now = time.monotonic()
+    with live_lock:
+        stale = [s for s in live_sessions.values() if now - s.last_seen > config.LIVE_IDLE_TIMEOUT]
+        for session in stale:
+            live_sessions.pop(session.session_id, None)
+    for session in stale:
+        session.close()
+        try:
+            os.remove(session.video_path)
+        except:
+            pass
+
+live_reaper = None
+
+def start_live_reaper():
+    # Abandoned sessions are closed on a timer, not only when another client
+    # starts a session. One thread per worker process.
+    global live_reaper
+    with live_lock:
+        if live_reaper is not None:
+            return
+        live_reaper = threading.Thread(target=reap_live_sessions_forever, daemon=True)
+    live_reaper.start()
+
+def reap_live_sessions_forever():
+    while True:
+        time.sleep(config.LIVE_IDLE_TIMEOUT / 4)
+        try:
+            reap_live_sessions()
+        except Exception as e:
+            print(f"Warning: Could not reap live sessions: {e}")
+
+def get_live_session(session_id):
+    with live_lock:
+        return live_sessions.get(session_id)
+
+@app.route('/live/start', methods=['POST'])
+def live_start():
+    from engine.live import LiveSession
+
+    if not config.LIVE_ENABLED:
+        return jsonify({'error': 'Live ingest is disabled'}), 404
+    if not os.path.exists(config.POSE_MODEL_PATH):
+        return jsonify({'error': f"Pose model not found: {config.POSE_MODEL_PATH}"}), 500
+
+    start_live_reaper()
+    reap_live_sessions()
+    # The slot is reserved before the session is built, since building it
+    # (pose graph, history buffers, worker thread) takes a while
+    global live_pending
+    with live_lock:
+        if len(live_sessions) + live_pending >= config.LIVE_MAX_SESSIONS:
+            return jsonify({'error': 'Too many live sessions'}), 503, {'Retry-After': '30'}
+        live_pending += 1
+
+    data = request.get_json(silent=True) or {}
+    session_id = str(uuid.uuid4())
+    video_path = os.path.join(app.config['OUTPUT_FOLDER'], f"temp_{session_id}.avi")
+    try:
+        session = LiveSession(session_id, video_path, mirror=bool(data.get('mirror', True)))
+    except Exception:
+        with live_lock:
+            live_pending -= 1
+        raise
+    with live_lock:
+        live_pending -= 1
+        live_sessions[session_id] = session
+
+    return jsonify({
+        'session_id': session_id,
+        'frame_url': f"/live/{session_id}/frame",
+        'stream_url': f"/live/{session_id}/stream"
+    })
+
+@app.route('/live/<session_id>/frame', methods=['POST'])
+def live_frame(session_id):
+    session = get_live_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+
+    timestamp = request.headers.get('X-Timestamp-Ms', request.args.get('ts'))
+    try:
+        timestamp_ms = float(timestamp)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Missing or invalid X-Timestamp-Ms'}), 400
+
+    data = request.get_data()
+    if not data:
+        return jsonify({'error': 'Empty frame'}), 400
+
+    try:
+        session.submit(data, timestamp_ms)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    return jsonify(session.stats())
+
+@app.route('/live/<session_id>/stream')
+def live_stream(session_id):
+    session = get_live_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+
+    def generate():
+        for jpeg in session.frames():
+            yield b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: ' + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n'
+
+    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@app.route('/live/<session_id>/stop', methods=['POST'])
+def live_stop(session_id):
+    from engine.audio import AudioEngine
+
+    with live_lock:
+        session = live_sessions.pop(session_id, None)
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+
+    session.close()
+    stats = session.stats()
+    if not session.collector.spectral_hist or session.frames_written == 0:
+        try:
+            os.remove(session.video_path)
+        except:
+            pass
+        return jsonify({'error': 'No motion data collected', 'stats': stats}), 400
+
+    retry = False
+    try:
+        # The render competes with uploads and sample jobs for the same budget
+        probe = probe_video(session.video_path)
+        with admission.admit(admission.estimate_cost(probe)):
+            output_path, spectrogram_path = render_outputs(
+                AudioEngine(), session.collector, session.video_path, session_id, session.duration
+            )
+    except admission.Overloaded as e:
+        # Keep the recording so the client can stop again after Retry-After;
+        # the reaper discards it if they never do
+        retry = e.retry_after is not None
+        if retry:
+            session.last_seen = time.monotonic()
+            with live_lock:
+                live_sessions[session_id] = session
+        return overloaded_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e), 'stats': stats}), 500
+    finally:
+        # render_outputs only removes the recording when it succeeds
+        if not retry and os.path.exists(session.video_path):
+            os.remove(session.video_path)
+
+    return jsonify({
+        'success': True,
+        'output_id': session_id,
+        'filename': os.path.basename(output_path),
+        'spectrogram_filename': os.path.basename(spectrogram_path),
+        'stats': stats
+    })
+
 @app.route('/video/<output_id>')
 def serve_video(output_id):
     filename = f"final_{output_id}.mp4"
@@ -316,6 +552,18 @@ def serve_video(output_id):
     
     return send_file(filepath, mimetype='video/mp4')
 
+@app.route('/mode_audio/<output_id>/<mode>')
+def serve_mode_audio(output_id, mode):
+    from engine.audio import MODES
+    if mode not in MODES:
+        return jsonify({'error': 'Unknown mode'}), 404
+    filepath = mode_track_path(secure_filename(output_id), mode)
+    
+    if not os.path.exists(filepath):
+        return jsonify({'error': 'Track not found'}), 404
+    
+    return send_file(filepath, mimetype='audio/wav')
+
 @app.route('/spectrogram/<output_id>')
 def serve_spectrogram(output_id):
     filename = f"spectrogram_{output_id}.png"
@@ -364,12 +612,28 @@ def serve_spectrogram_data(output_id):
 
 @app.route('/sample_preview/<path:filename>')
 def serve_sample_preview(filename):
-    from urllib.parse import unquote
-    filename = unquote(filename)
-    filepath = os.path.join('Samples', filename)
-    if not os.path.exists(filepath):
+    entry = sample_catalog.get(filename)
+    if entry is None:
         return jsonify({'error': 'Sample not found'}), 404
-    return send_file(filepath, mimetype='video/mp4')
+    try:
+        path, mimetype = sample_catalog.preview(entry), 'video/mp4'
+    except Exception as e:
+        # No proxy (e.g. no ffmpeg): fall back to the source, correctly labelled
+        print(f"Warning: Could not build preview for {filename}: {e}")
+        path = entry['path']
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return send_file(path, mimetype=mimetype, max_age=config.SAMPLE_CACHE_MAX_AGE)
+
+@app.route('/sample_thumbnail/<path:filename>')
+def serve_sample_thumbnail(filename):
+    entry = sample_catalog.get(filename)
+    if entry is None:
+        return jsonify({'error': 'Sample not found'}), 404
+    try:
+        path = sample_catalog.thumbnail(entry)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    return send_file(path, mimetype='image/jpeg', max_age=config.SAMPLE_CACHE_MAX_AGE)
 
 @app.route('/download/<output_id>')
 def download_file(output_id):
@@ -382,5 +646,8 @@ def download_file(output_id):
     return send_file(filepath, as_attachment=True, download_name=f"camera_synth_{output_id}.mp4")
 
 if __name__ == '__main__':
+    # HTTP/1.1 so live clients can keep one connection open for all frames
+    from werkzeug.serving import WSGIRequestHandler
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
     app.run(debug=False, host='0.0.0.0', port=5000)
 
@@ -0,0 +1,100 @@
+# benchmarks/effects.py
+# Compare the vectorized effects chain against the original loop-based
+# implementations. Run from the project root:
+#   python -m benchmarks.effects [seconds]
+import sys
+import time
+import tracemalloc
+import numpy as np
+import scipy.ndimage
+import config
+from engine import effects
+
+
+def legacy_reverb(audio, sr, delay_s=0.3, decay=0.5):
+    delay_samples = int(sr * delay_s)
+    if delay_samples >= len(audio):
+        return audio
+    output = audio.copy()
+    output[delay_samples:] += output[:-delay_samples] * decay
+    return output
+
+
+def legacy_granular(audio, sr, grain_ms=50, overlap=0.5):
+    n = len(audio)
+    grain_len = max(10, int(sr * grain_ms * 0.001))
+    step = max(1, int(grain_len * (1.0 - overlap)))
+    if grain_len >= n:
+        return audio
+    grain_starts = np.arange(0, n - grain_len, step)
+    grains = np.array([audio[i:i+grain_len] for i in grain_starts])
+    grains *= np.hanning(grain_len)
+    np.random.shuffle(grains)
+    out = np.zeros(n, dtype=audio.dtype)
+    for i, grain in enumerate(grains):
+        pos = i * step
+        end = min(pos + grain_len, n)
+        out[pos:end] += grain[:end-pos]
+    max_val = np.max(np.abs(out))
+    return (out / (max_val + 1e-6)) * 0.9 if max_val > 0 else out
+
+
+def legacy_rhythmic_gate(audio, motion_curve, sr):
+    m_smooth = scipy.ndimage.gaussian_filter1d(
+        motion_curve, sigma=max(1, len(motion_curve) // 200)
+    )
+    threshold = np.mean(m_smooth) + 0.5 * np.std(m_smooth)
+    peaks = np.where(
+        (m_smooth[1:-1] > m_smooth[:-2]) &
+        (m_smooth[1:-1] > m_smooth[2:]) &
+        (m_smooth[1:-1] > threshold)
+    )[0] + 1
+    env = np.full(len(audio), 0.15, dtype=np.float32)
+    width = int(0.06 * sr)
+    for p in peaks:
+        center = int(p * len(audio) / len(motion_curve))
+        indices = np.arange(max(0, center - width), min(len(audio), center + width))
+        env[indices] = np.maximum(env[indices], 1.0 - np.abs(indices - center) / width)
+    return audio * env
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    sr = config.SR
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * sr)) * 0.3).astype(np.float32)
+    motion = np.abs(rng.standard_normal(int(seconds * 30))).astype(np.float32)
+
+    cases = [
+        ("reverb", legacy_reverb, lambda a, s: effects.reverb(a, s, out=a), ()),
+        ("granular", legacy_granular, effects.granular, ()),
+        ("rhythmic_gate", legacy_rhythmic_gate,
+         lambda a, s: effects.rhythmic_gate(a, motion, s, out=a), (motion,)),
+    ]
+    # One short untimed run of each, so lazy scipy imports and first-call
+    # setup are not billed to the filters
+    warm = audio[:sr]
+    for _, old, new, extra in cases:
+        old(warm.copy(), *extra, sr)
+        new(warm.copy(), sr)
+
+    print(f"{seconds:.0f}s of audio at {sr} Hz")
+    print(f"{'effect':<16}{'legacy s':>10}{'new s':>10}{'legacy MB':>12}{'new MB':>10}")
+    for name, old, new, extra in cases:
+        old_t, old_mb = measure(old, audio.copy(), *extra, sr)
+        new_t, new_mb = measure(new, audio.copy(), sr)
+        print(f"{name:<16}{old_t:>10.3f}{new_t:>10.3f}{old_mb:>12.1f}{new_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
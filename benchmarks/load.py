@@ -0,0 +1,491 @@
+# benchmarks/load.py
+# Closed-loop load generator for the web app. Starts the app (gunicorn with
+# the bundled config, or the Flask server) in a scratch directory filled with
+# synthetic sample videos, drives a weighted mix of uploads, sample renders
+# and artifact fetches from `concurrency` clients, and reports throughput,
+# latency percentiles, error rates and the server's per-process memory.
+# Everything runs on localhost. Run from the project root:
+#   python -m benchmarks.load [--server gunicorn|flask] [--workers 2]
+#       [--concurrency 4] [--duration 60] [--mix upload=1,sample=1,video=4,spectrogram_data=4]
+# or against an app that is already running:
+#   python -m benchmarks.load --url http://localhost:5000 --samples Samples [--pid PID]
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+import cv2
+import numpy as np
+import config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATIONS = ('upload', 'sample', 'video', 'spectrogram_data', 'samples')
+FETCHES = ('video', 'spectrogram_data')
+
+
+def make_video(path, seconds, fps, size, seed):
+    # A bright figure moving over a dark background, so flow, trails and
+    # the spectrum have something to work with
+    w, h = size
+    rng = np.random.default_rng(seed)
+    fx, fy = rng.uniform(6, 12, 2)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+    for i in range(int(seconds * fps)):
+        frame = np.full((h, w, 3), 40, np.uint8)
+        x = int(w / 2 + w / 3 * np.sin(i / fx))
+        y = int(h / 2 + h / 4 * np.cos(i / fy))
+        r = max(4, h // 8)
+        cv2.circle(frame, (x, y), r, (200, 180, 160), -1)
+        cv2.rectangle(frame, (x - r // 2, y + r), (x + r // 2, y + 3 * r), (180, 160, 140), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def process_tree(pid):
+    # pid and its descendants, from /proc
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(children.get(p, ()))
+    return tree
+
+
+def rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Server:
+    # The app under test, started in `workdir` so its uploads/, outputs/,
+    # Samples/ and sample_cache/ stay out of the project tree
+
+    def __init__(self, kind, workdir, workers, threads):
+        self.kind = kind
+        self.workdir = workdir
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+        if kind == 'gunicorn':
+            env.update(BIND=f"127.0.0.1:{self.port}", WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads))
+            cmd = [sys.executable, '-m', 'gunicorn', 'app:app', '-c', os.path.join(ROOT, 'gunicorn.conf.py')]
+        else:
+            cmd = [sys.executable, '-m', 'flask', '--app', 'app', 'run',
+                   '--host', '127.0.0.1', '--port', str(self.port), '--with-threads']
+        self.log_path = os.path.join(workdir, 'server.log')
+        self.log = open(self.log_path, 'wb')
+        self.proc = subprocess.Popen(cmd, cwd=workdir, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+        self.pid = self.proc.pid
+
+    def wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise SystemExit(f"{self.kind} exited with {self.proc.returncode}; see {self.log_path}")
+            try:
+                status, _, _ = Client(self.url, timeout=5).call('GET', '/healthz')
+                if status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.5)
+        raise SystemExit(f"{self.kind} did not become ready in {timeout}s; see {self.log_path}")
+
+    def stop(self):
+        if self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+            try:
+                self.proc.wait(30)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.log.close()
+
+
+class Client:
+    # One kept-alive connection; reopened after any transport error
+
+    def __init__(self, url, timeout):
+        u = urlparse(url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.timeout = timeout
+        self.conn = None
+
+    def call(self, method, path, body=None, headers=None):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self.conn.request(method, path, body=body, headers=headers or {})
+            resp = self.conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+        if resp.getheader('Connection', '').lower() == 'close':
+            self.conn.close()
+            self.conn = None
+        return resp.status, resp.getheader('Content-Type', ''), data
+
+
+def multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, data) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = {}  # op -> list of (latency_s, status, bytes)
+        self.outputs = []
+        self.errors = {}
+
+    def record(self, op, latency, status, size, error=None):
+        with self.lock:
+            self.rows.setdefault(op, []).append((latency, status, size))
+            if error:
+                key = (op, error[:120])
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def add_output(self, output_id):
+        with self.lock:
+            self.outputs.append(output_id)
+
+    def pick_output(self, rng):
+        with self.lock:
+            return rng.choice(self.outputs) if self.outputs else None
+
+
+class Runner:
+    def __init__(self, url, samples, mix, all_modes, timeout):
+        self.url = url
+        self.samples = samples  # filename -> bytes
+        self.names = sorted(samples)
+        self.ops = list(mix)
+        self.weights = [mix[op] for op in self.ops]
+        self.all_modes = all_modes
+        self.timeout = timeout
+        self.results = Results()
+
+    def run_op(self, client, op, rng):
+        if op == 'upload':
+            name = rng.choice(self.names)
+            fields = {'all_modes': '1'} if self.all_modes else {}
+            body, ctype = multipart(fields, {'video': (name, self.samples[name])})
+            return client.call('POST', '/upload', body, {'Content-Type': ctype})
+        if op == 'sample':
+            body = json.dumps({'filename': rng.choice(self.names), 'all_modes': self.all_modes})
+            return client.call('POST', '/process_sample', body, {'Content-Type': 'application/json'})
+        if op == 'samples':
+            return client.call('GET', '/samples')
+        output_id = self.results.pick_output(rng)
+        path = f"/video/{output_id}" if op == 'video' else f"/spectrogram_data/{output_id}"
+        return client.call('GET', path)
+
+    def one(self, client, op, rng):
+        start = time.perf_counter()
+        try:
+            status, ctype, data = self.run_op(client, op, rng)
+        except (OSError, http.client.HTTPException) as e:
+            self.results.record(op, time.perf_counter() - start, 0, 0, f"{type(e).__name__}: {e}")
+            return
+        latency = time.perf_counter() - start
+        error = None
+        if status != 200 and status != 503:
+            try:
+                error = f"{status} {json.loads(data).get('error', '')}"
+            except (ValueError, AttributeError):
+                error = f"{status} {data[:80]!r}"
+        elif status == 200 and op in ('upload', 'sample'):
+            self.results.add_output(json.loads(data)['output_id'])
+        self.results.record(op, latency, status, len(data), error)
+
+    def worker(self, seed, deadline, budget):
+        rng = random.Random(seed)
+        client = Client(self.url, self.timeout)
+        while time.monotonic() < deadline and budget():
+            op = rng.choices(self.ops, self.weights)[0]
+            # Nothing to fetch until some job has finished
+            if op in FETCHES and not self.results.outputs:
+                op = 'sample'
+            self.one(client, op, rng)
+
+    def run(self, concurrency, duration, n_requests, seed):
+        deadline = time.monotonic() + duration if duration else float('inf')
+        lock = threading.Lock()
+        remaining = [n_requests]
+
+        def budget():
+            if n_requests is None:
+                return True
+            with lock:
+                remaining[0] -= 1
+                return remaining[0] >= 0
+
+        threads = [threading.Thread(target=self.worker, args=(seed + i, deadline, budget), daemon=True)
+                   for i in range(concurrency)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return time.perf_counter() - start
+
+
+class Monitor:
+    # Samples RSS of every process in the server tree and the admission
+    # state from /healthz while the load runs
+
+    def __init__(self, pid, url, interval):
+        self.pid = pid
+        self.url = url
+        self.interval = interval
+        self.peak = {}
+        self.last = {}
+        self.cmd = {}
+        self.alive = set()
+        self.tree_peak = 0.0
+        self.load_peak = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def sample(self):
+        if self.pid is not None and os.path.isdir('/proc'):
+            alive = set()
+            for p in process_tree(self.pid):
+                mb = rss_mb(p)
+                if mb is None:
+                    continue
+                alive.add(p)
+                self.peak[p] = max(self.peak.get(p, 0.0), mb)
+                self.last[p] = mb
+                if p not in self.cmd:
+                    try:
+                        with open(f'/proc/{p}/cmdline', 'rb') as f:
+                            self.cmd[p] = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+                    except OSError:
+                        self.cmd[p] = '?'
+            self.alive = alive
+            self.tree_peak = max(self.tree_peak, sum(self.last[p] for p in alive))
+        try:
+            status, _, data = Client(self.url, 5).call('GET', '/healthz')
+            if status == 200:
+                for key, value in json.loads(data).get('load', {}).items():
+                    if isinstance(value, (int, float)):
+                        self.load_peak[key] = max(self.load_peak.get(key, value), value)
+        except (OSError, http.client.HTTPException, ValueError):
+            pass
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else float('nan')
+
+
+def report(results, elapsed, monitor):
+    print(f"\n{elapsed:.1f}s wall clock")
+    print(f"{'endpoint':<18}{'count':>7}{'ok':>6}{'503':>6}{'err':>6}{'err %':>7}"
+          f"{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'MB/s':>8}")
+    everything = []
+    for op in OPERATIONS:
+        rows = results.rows.get(op)
+        if not rows:
+            continue
+        everything.extend(rows)
+        print_row(op, rows, elapsed)
+    if everything:
+        print_row('total', everything, elapsed)
+
+    if results.errors:
+        print("\nerrors")
+        for (op, message), count in sorted(results.errors.items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>5}  {op:<16} {message}")
+
+    if monitor.load_peak:
+        print("\npeak admission state: " + ", ".join(f"{k}={v}" for k, v in sorted(monitor.load_peak.items())))
+
+    if monitor.peak:
+        # Processes still running, one row each; short-lived children such as
+        # ffmpeg grouped by executable
+        print(f"\n{'pid':>8}{'peak MB':>10}{'last MB':>10}  command")
+        for p in sorted(monitor.alive):
+            print(f"{p:>8}{monitor.peak[p]:>10.0f}{monitor.last[p]:>10.0f}  {monitor.cmd.get(p, '')[:70]}")
+        exited = {}
+        for p in set(monitor.peak) - monitor.alive:
+            name = os.path.basename(monitor.cmd.get(p, '?').split(' ')[0])
+            count, peak = exited.get(name, (0, 0.0))
+            exited[name] = (count + 1, max(peak, monitor.peak[p]))
+        for name, (count, peak) in sorted(exited.items()):
+            print(f"{'exited':>8}{peak:>10.0f}{'':>10}  {count} x {name}")
+        print(f"peak RSS of the whole server tree: {monitor.tree_peak:.0f} MB")
+
+
+def print_row(name, rows, elapsed):
+    count = len(rows)
+    ok = [lat for lat, status, _ in rows if status == 200]
+    shed = sum(1 for _, status, _ in rows if status == 503)
+    err = count - len(ok) - shed
+    mb = sum(size for _, status, size in rows if status == 200) / 1e6
+    print(f"{name:<18}{count:>7}{len(ok):>6}{shed:>6}{err:>6}{100 * err / count:>7.1f}"
+          f"{len(ok) / elapsed:>8.2f}{percentile(ok, 50):>9.0f}{percentile(ok, 95):>9.0f}"
+          f"{percentile(ok, 99):>9.0f}{mb / elapsed:>8.2f}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        op, _, weight = part.partition('=')
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {op!r}; choose from {', '.join(OPERATIONS)}")
+        mix[op] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("mix has no positive weights")
+    return {op: w for op, w in mix.items() if w > 0}
+
+
+def parse_size(text):
+    w, _, h = text.lower().partition('x')
+    return int(w), int(h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the web app on localhost")
+    parser.add_argument('--url', help="test an app that is already running instead of starting one")
+    parser.add_argument('--pid', type=int, help="with --url: server pid whose process tree is sampled for memory")
+    parser.add_argument('--samples', help="with --url: the app's Samples directory, filled with the synthetic videos")
+    parser.add_argument('--server', choices=('gunicorn', 'flask'), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers")
+    parser.add_argument('--threads', type=int, default=1, help="gunicorn threads per worker")
+    parser.add_argument('--concurrency', type=int, default=4, help="clients issuing requests back to back")
+    parser.add_argument('--duration', type=float, default=60.0, help="seconds of load (0 = until --requests are done)")
+    parser.add_argument('--requests', type=int, help="stop after this many requests")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('upload=1,sample=1,video=4,spectrogram_data=4'),
+                        help="weights of " + ', '.join(OPERATIONS))
+    parser.add_argument('--all-modes', action='store_true', help="render every synthesis mode in each job")
+    parser.add_argument('--videos', type=int, default=3, help="synthetic sample videos")
+    parser.add_argument('--seconds', type=float, default=4.0, help="length of each synthetic video")
+    parser.add_argument('--size', type=parse_size, default=(640, 480))
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--timeout', type=float, default=600.0, help="per-request timeout")
+    parser.add_argument('--interval', type=float, default=0.5, help="memory sampling interval")
+    parser.add_argument('--workdir', help="scratch directory for the server (default: a temp dir)")
+    parser.add_argument('--keep', action='store_true', help="keep the scratch directory")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if not args.duration and args.requests is None:
+        parser.error("--duration 0 needs --requests")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='camsynth-load-')
+    samples_dir = args.samples or os.path.join(workdir, config.SAMPLES_DIR)
+    os.makedirs(samples_dir, exist_ok=True)
+    samples = {}
+    for i in range(args.videos):
+        name = f"load_{i}_{args.size[0]}x{args.size[1]}_{args.seconds:g}s.mp4"
+        path = os.path.join(samples_dir, name)
+        if not os.path.exists(path):
+            make_video(path, args.seconds, args.fps, args.size, args.seed + i)
+        with open(path, 'rb') as f:
+            samples[name] = f.read()
+    print(f"{len(samples)} synthetic videos of {args.size[0]}x{args.size[1]}, {args.seconds:g}s in {samples_dir}")
+
+    server = None
+    if args.url:
+        url, pid = args.url.rstrip('/'), args.pid
+    else:
+        model = config.POSE_MODEL_PATH
+        if not os.path.isabs(model) and os.path.exists(os.path.join(ROOT, model)):
+            target = os.path.join(workdir, model)
+            if not os.path.exists(target):
+                os.symlink(os.path.join(ROOT, model), target)
+        elif not os.path.exists(model):
+            print(f"warning: pose model {model} not found; render jobs will fail")
+        if args.server == 'gunicorn' and config.LIVE_ENABLED:
+            print("note: LIVE_ENABLED is set, so gunicorn.conf.py runs one gthread worker "
+                  f"with at least {config.LIVE_THREADS} threads; --workers/--threads are overridden")
+        server = Server(args.server, workdir, args.workers, args.threads)
+        print(f"starting {args.server} on {server.url} (log: {server.log_path})")
+        server.wait_ready(120)
+        url, pid = server.url, server.pid
+
+    monitor = Monitor(pid, url, args.interval)
+    try:
+        runner = Runner(url, samples, args.mix, args.all_modes, args.timeout)
+        # Make sure the sample catalogue has seen the videos before the clock starts
+        status, _, data = Client(url, args.timeout).call('GET', '/samples')
+        listed = {s['filename'] for s in json.loads(data).get('samples', [])} if status == 200 else set()
+        if not set(samples) <= listed:
+            print("warning: the app does not list the synthetic videos; sample renders will 404")
+
+        print(f"{args.concurrency} clients, mix "
+              + ', '.join(f"{op}={w:g}" for op, w in args.mix.items())
+              + (f", {args.duration:g}s" if args.duration else "")
+              + (f", {args.requests} requests" if args.requests else ""))
+        monitor.start()
+        elapsed = runner.run(args.concurrency, args.duration, args.requests, args.seed)
+        monitor.stop()
+        monitor.sample()
+        report(runner.results, elapsed, monitor)
+    finally:
+        if monitor.thread.is_alive():
+            monitor.stop()
+        if server:
+            server.stop()
+        if args.keep or args.workdir:
+            print(f"\nscratch directory kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
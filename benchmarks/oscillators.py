@@ -0,0 +1,79 @@
+# benchmarks/oscillators.py
+# Compare the block-based FM and Doppler synthesizers against the original
+# full-length float64 implementations. The Doppler rows differ by design:
+# the original multiplied its swept frequency by absolute time instead of
+# integrating phase. Run from the project root:
+#   python -m benchmarks.oscillators [seconds]
+import sys
+import time
+import tracemalloc
+import numpy as np
+import config
+from engine.audio import AudioEngine
+
+
+def legacy_fm_synth(sr, duration, scale, motion_curve, torso_activity, spread):
+    n = int(duration * sr)
+    t = np.linspace(0.0, duration, n, endpoint=False)
+    base_freq = scale[len(scale)//2] if scale else 220.0
+    two_pi = 2.0 * np.pi
+    m = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(motion_curve)), motion_curve)
+    index = 2.0 * m * (1.0 + min(torso_activity * 50, 4.0)) * (1.0 + spread)
+    mod = np.sin(two_pi * (base_freq * 2) * t)
+    y = np.sin(two_pi * base_freq * t + index * mod) * np.hanning(n)
+    max_val = np.max(np.abs(y))
+    return (y / (max_val + 1e-6)) * 0.9 if max_val > 0 else y
+
+
+def legacy_doppler_fm_synth(sr, duration, scale, motion_curve, spin_intensity):
+    n = int(duration * sr)
+    t = np.linspace(0.0, duration, n, endpoint=False)
+    base_freq = scale[len(scale)//2] if scale else 220.0
+    two_pi = 2.0 * np.pi
+    m = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(motion_curve)), motion_curve)
+    doppler_freq = base_freq * (1.0 + spin_intensity * np.sin(two_pi * 0.5 * t))
+    index = 2.0 * m * (1.0 + spin_intensity * 2.0)
+    mod = np.sin(two_pi * (doppler_freq * 2) * t)
+    y = np.sin(two_pi * doppler_freq * t + index * mod) * np.hanning(n)
+    max_val = np.max(np.abs(y))
+    return (y / (max_val + 1e-6)) * 0.9 if max_val > 0 else y
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 1e6
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    sr = config.SR
+    engine = AudioEngine()
+    scale = config.CIRCLE_OF_FIFTHS[3]
+    rng = np.random.default_rng(0)
+    # Frame-rate motion curve, as DataCollector records it
+    motion = np.clip(np.abs(rng.standard_normal(int(seconds * 30))) * 0.3, 0, 1)
+
+    cases = [
+        ("fm", lambda: legacy_fm_synth(sr, seconds, scale, motion, 0.02, 0.3),
+         lambda: engine._fm_synth(seconds, scale, motion, 0.02, 0.3)),
+        ("doppler_fm", lambda: legacy_doppler_fm_synth(sr, seconds, scale, motion, 0.5),
+         lambda: engine._doppler_fm_synth(seconds, scale, motion, 0.5)),
+    ]
+
+    print(f"{seconds:.0f}s of audio at {sr} Hz")
+    print(f"{'synth':<12}{'legacy s':>10}{'new s':>10}{'legacy MB':>12}{'new MB':>10}{'max diff':>10}")
+    for name, old, new in cases:
+        y_old, old_t, old_mb = measure(old)
+        y_new, new_t, new_mb = measure(new)
+        n = min(len(y_old), len(y_new))
+        diff = np.max(np.abs(y_old[:n] - y_new[:n]))
+        print(f"{name:<12}{old_t:>10.3f}{new_t:>10.3f}{old_mb:>12.1f}{new_mb:>10.1f}{diff:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
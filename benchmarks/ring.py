@@ -0,0 +1,115 @@
+# benchmarks/ring.py
+# Moves a 640x480 frame plus the three analysis-size float32 fields from a
+# producer process to a consumer process, either pickled through a
+# multiprocessing.Queue or written into a FrameRing with only slot indices
+# on the queues. Run from the project root:
+#   python -m benchmarks.ring [frames] [slots]
+import multiprocessing
+import sys
+import time
+import numpy as np
+from engine.ring import FrameRing
+
+FRAME = (480, 640, 3)
+FIELD = (240, 320)
+
+
+def make_payload(i):
+    frame = np.full(FRAME, i % 256, dtype=np.uint8)
+    fields = [np.full(FIELD, i, dtype=np.float32) for _ in range(3)]
+    return frame, fields
+
+
+def pickle_producer(q, n):
+    for i in range(n):
+        q.put(make_payload(i))
+    q.put(None)
+
+
+def pickle_consumer(q, done):
+    total = 0.0
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        frame, fields = item
+        total += frame[0, 0, 0] + sum(f[0, 0] for f in fields)
+    done.put(total)
+
+
+def ring_producer(ring, free_q, q, n):
+    for i in range(n):
+        slot = free_q.get()
+        frame, fields = make_payload(i)
+        ring['frame'][slot] = frame
+        for k, f in zip(('mag', 'c_ang', 'c_mag'), fields):
+            ring[k][slot] = f
+        ring.seq[slot] = i
+        q.put(slot)
+    q.put(None)
+
+
+def ring_consumer(ring, free_q, q, done):
+    total = 0.0
+    while True:
+        slot = q.get()
+        if slot is None:
+            break
+        total += ring['frame'][slot][0, 0, 0] + sum(ring[k][slot][0, 0] for k in ('mag', 'c_ang', 'c_mag'))
+        free_q.put(slot)
+    done.put(total)
+
+
+def run_pickle(ctx, n, slots):
+    q, done = ctx.Queue(maxsize=slots), ctx.Queue()
+    procs = [ctx.Process(target=pickle_producer, args=(q, n)),
+             ctx.Process(target=pickle_consumer, args=(q, done))]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    total = done.get()
+    for p in procs:
+        p.join()
+    return time.perf_counter() - start, total
+
+
+def run_ring(ctx, n, slots):
+    ring = FrameRing({
+        'frame': (FRAME, np.uint8),
+        'mag': (FIELD, np.float32),
+        'c_ang': (FIELD, np.float32),
+        'c_mag': (FIELD, np.float32),
+    }, slots)
+    free_q, q, done = ctx.Queue(), ctx.Queue(), ctx.Queue()
+    for slot in range(slots):
+        free_q.put(slot)
+    procs = [ctx.Process(target=ring_producer, args=(ring, free_q, q, n)),
+             ctx.Process(target=ring_consumer, args=(ring, free_q, q, done))]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    total = done.get()
+    for p in procs:
+        p.join()
+    ring.close()
+    return time.perf_counter() - start, total
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    slots = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    ctx = multiprocessing.get_context("spawn")
+    item_mb = (np.prod(FRAME) + 3 * np.prod(FIELD) * 4) / 1e6
+
+    print(f"{n} items of {item_mb:.2f} MB, {slots} slots in flight")
+    print(f"{'transport':<16}{'s':>8}{'items/s':>10}{'MB/s':>10}")
+    results = {}
+    for name, fn in (("pickled queue", run_pickle), ("shared ring", run_ring)):
+        run_time, total = fn(ctx, n, slots)
+        results[name] = total
+        print(f"{name:<16}{run_time:>8.2f}{n / run_time:>10.0f}{n * item_mb / run_time:>10.0f}")
+    assert len(set(results.values())) == 1, "transports disagree"
+
+
+if __name__ == "__main__":
+    main()
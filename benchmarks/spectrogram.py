@@ -0,0 +1,61 @@
+# benchmarks/spectrogram.py
+# Time the OpenCV spectrogram renderer against the old matplotlib figure
+# (skipped if matplotlib is not installed). Run from the project root:
+#   python -m benchmarks.spectrogram [frames] [out_dir]
+import os
+import sys
+import time
+import numpy as np
+import config
+from engine.spectrogram import save_spectrogram_png
+
+
+def legacy_save(S, output_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(12, 6))
+    im = ax.imshow(S, aspect='auto', origin='lower', cmap='viridis', interpolation='bilinear')
+    plt.colorbar(im, ax=ax, label='Magnitude (dB)')
+    ax.set_xlabel('Time (frames)')
+    ax.set_ylabel('Frequency (bins)')
+    ax.set_title('Motion-to-Sound Spectrogram')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=100, bbox_inches='tight')
+    plt.close(fig)
+
+
+def best_of(fn, runs=3):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 900
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else 'outputs'
+    rng = np.random.default_rng(0)
+    S = np.log1p(rng.gamma(0.5, 1.0, (config.N_BINS, frames))).astype(np.float32)
+    S = S / S.max() * 60.0
+
+    new_path = os.path.join(out_dir, 'bench_spectrogram_cv.png')
+    new_t = best_of(lambda: save_spectrogram_png(S, new_path))
+    print(f"{frames} frames x {config.N_BINS} bins")
+    print(f"opencv      {new_t * 1000:8.1f} ms  -> {new_path}")
+
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        print("matplotlib  not installed, skipped")
+        return
+    old_path = os.path.join(out_dir, 'bench_spectrogram_mpl.png')
+    old_t = best_of(lambda: legacy_save(S, old_path))
+    print(f"matplotlib  {old_t * 1000:8.1f} ms  -> {old_path}")
+    print(f"speedup     {old_t / new_t:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
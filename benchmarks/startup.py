@@ -0,0 +1,57 @@
+# benchmarks/startup.py
+# Cold-start cost of the CLI/worker entry points, each measured in a fresh
+# interpreter. The "eager" row imports what engine/audio.py used to pull in
+# at module load, for comparison; matplotlib and moviepy are no longer
+# requirements, so they are included only if installed. Run from the
+# project root:
+#   python -m benchmarks.startup [runs]
+import importlib.util
+import subprocess
+import sys
+import time
+
+EAGER = ["librosa", "scipy.ndimage", "scipy.signal", "soundfile", "imageio_ffmpeg"]
+EAGER_OPTIONAL = ["matplotlib.pyplot", "moviepy.editor"]
+
+
+def installed(module):
+    return importlib.util.find_spec(module.split('.')[0]) is not None
+
+
+def eager_case():
+    optional = [m for m in EAGER_OPTIONAL if installed(m)]
+    for m in EAGER_OPTIONAL:
+        if m not in optional:
+            print(f"{m} not installed; left out of the eager row")
+    code = "import " + ", ".join(EAGER + optional) + "; imageio_ffmpeg.get_ffmpeg_exe()"
+    return ("eager audio deps", code)
+
+
+def run(code):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True)
+    elapsed = time.perf_counter() - start
+    return elapsed if proc.returncode == 0 else None
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run("pass")  # warm the OS file cache
+    base = min(run("pass") for _ in range(runs))
+    print(f"interpreter baseline {base:.3f}s (subtracted below)")
+    cases = [
+        ("import engine.audio", "import engine.audio"),
+        ("import app", "import app"),
+        eager_case(),
+    ]
+    for name, code in cases:
+        times = [run(code) for _ in range(runs)]
+        if None in times:
+            print(f"{name:<22} failed (missing dependency?)")
+            continue
+        times.sort()
+        print(f"{name:<22} median {times[len(times) // 2] - base:.3f}s  best {times[0] - base:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
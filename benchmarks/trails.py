@@ -0,0 +1,63 @@
+# benchmarks/trails.py
+# Per-frame cost of trail colorization and compositing: the original HSV
+# image + cvtColor + float blend against TrailRenderer, which gathers from
+# the LUT for sparse trails and converts the whole plane for dense ones, for
+# trail canvases covering different fractions of the frame. Run from the
+# project root:
+#   python -m benchmarks.trails [frames]
+import sys
+import time
+import cv2
+import numpy as np
+from engine.visuals import TrailRenderer
+
+HSV_SCALE = 90.0 / np.pi
+
+
+def legacy_render(frame, c_ang, c_mag, render_size):
+    h, w = c_mag.shape
+    hsv = np.zeros((h, w, 3), dtype=np.uint8)
+    hsv[..., 0] = (c_ang * HSV_SCALE).astype(np.uint8)
+    hsv[..., 1] = 255
+    hsv[..., 2] = np.clip(c_mag * 10, 0, 255).astype(np.uint8)
+    trail = cv2.resize(cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR), render_size, interpolation=cv2.INTER_LINEAR)
+    return cv2.add((frame * 0.6).astype(np.uint8), trail)
+
+
+def make_fields(analysis_size, coverage, rng):
+    aw, ah = analysis_size
+    # A blob of trail around the centre covering roughly `coverage` of the frame
+    yy, xx = np.mgrid[0:ah, 0:aw]
+    r = np.hypot((xx - aw / 2) / aw, (yy - ah / 2) / ah)
+    radius = np.sqrt(coverage / np.pi)
+    c_mag = np.where(r < radius, rng.uniform(0.05, 40.0, (ah, aw)), rng.uniform(0, 0.09, (ah, aw)))
+    c_ang = rng.uniform(0, 2 * np.pi, (ah, aw))
+    return c_ang.astype(np.float32), c_mag.astype(np.float32)
+
+
+def timed(fn, n):
+    fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        out = fn()
+    return (time.perf_counter() - start) / n * 1000, out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = np.random.default_rng(0)
+    print(f"{'analysis':<10}{'render':<10}{'coverage':>9}{'legacy ms':>11}{'lut ms':>9}{'max diff':>10}")
+    for analysis_size, render_size in (((320, 240), (640, 480)), ((640, 480), (640, 480))):
+        frame = rng.integers(0, 256, (render_size[1], render_size[0], 3), dtype=np.uint8)
+        renderer = TrailRenderer(analysis_size, render_size)
+        for coverage in (0.02, 0.2, 1.0):
+            c_ang, c_mag = make_fields(analysis_size, coverage, rng)
+            old_ms, old = timed(lambda: legacy_render(frame, c_ang, c_mag, render_size), n)
+            new_ms, new = timed(lambda: renderer.render(frame, c_ang, c_mag), n)
+            diff = int(np.max(np.abs(old.astype(np.int16) - new.astype(np.int16))))
+            print(f"{'%dx%d' % analysis_size:<10}{'%dx%d' % render_size:<10}{coverage:>9.0%}"
+                  f"{old_ms:>11.2f}{new_ms:>9.2f}{diff:>10}")
+
+
+if __name__ == "__main__":
+    main()
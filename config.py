@@ -1,10 +1,19 @@
 INPUT_SOURCE = None
 CAMERA_ID = 0
+# Output frames keep the source aspect and fit within WIDTH x HEIGHT
 WIDTH = 640
 HEIGHT = 480
+# Segmentation and optical flow run on this many pixels (source aspect kept)
+ANALYSIS_WIDTH = 320
+ANALYSIS_HEIGHT = 240
 TRAIL_DECAY = 0.85
 TRAIL_SPEED = 0.15
 FLOW_SENSITIVITY = 5.0
+# Frame size the flow thresholds, FLOW_SENSITIVITY and the motion histogram
+# were tuned on; other analysis sizes are rescaled to it
+REFERENCE_PIXELS = 640 * 480
+# Video files above this rate are analysed on every n-th frame (None = all frames)
+ANALYSIS_FPS = 30.0
 POSE_MODEL_PATH = "pose_landmarker_full.task"
 SHOW_SKELETON = False
 MAX_PEOPLE = 5
@@ -14,6 +23,13 @@ SR = 22050
 N_FFT = 4096
 HOP_LEN = 512
 N_BINS = N_FFT // 2 + 1
+# Griffin-Lim runs over blocks of spectrogram columns so memory stays bounded
+GL_BLOCK_FRAMES = 1024
+GL_BLOCK_OVERLAP = 32
+GL_N_ITER = 32
+# Per-frame histories keep this many frames in RAM and spill older ones to disk
+HISTORY_WINDOW = 900
+HISTORY_DIR = None  # None = system temp dir
 CIRCLE_OF_FIFTHS = [
     [130.81, 155.56, 174.61, 196.00, 233.08],
     [196.00, 233.08, 261.63, 293.66, 349.23],
@@ -25,5 +41,55 @@ CIRCLE_OF_FIFTHS = [
 ]
 ENABLE_VISUAL_EFFECTS = True
 ENABLE_ENSEMBLE = False
+# Run decode, visuals and pose of web jobs in separate processes that share
+# frames through a shared-memory ring (engine/pipeline.py)
+PARALLEL_ANALYSIS = False
+PIPELINE_SLOTS = 8
+PIPELINE_START_METHOD = "spawn"  # MediaPipe graphs are not fork-safe
+# Threads used when rendering every synthesis mode for preview
+MODE_PREVIEW_WORKERS = 3
+# Live ingest sessions (app.py /live/*). Sessions live in the memory of the
+# process that started them, so with live enabled gunicorn.conf.py runs a
+# single gthread worker; set False to scale jobs over several workers.
+LIVE_ENABLED = True
+LIVE_THREADS = 8  # gunicorn threads when live is enabled; each stream holds one
+LIVE_FPS = 30.0
+LIVE_QUEUE_SIZE = 2  # pending frames per session before the oldest is dropped
+LIVE_JPEG_QUALITY = 80
+LIVE_MAX_SESSIONS = 4
+LIVE_IDLE_TIMEOUT = 60  # seconds without frames before a session is discarded
+# Gesture detection (engine/classifier.py): frames in the sliding window, and
+# the share of a session a gesture must be held to pick the synthesis mode
+GESTURE_WINDOW = 30
+GESTURE_SESSION_SHARE = 0.3
+# Let a held gesture override the statistics when picking the mode. Off by
+# default, so gestures are only detected and reported.
+GESTURE_MODE_OVERRIDE = False
+# Admission control for web jobs (engine/admission.py). Budgets are shared
+# by all gunicorn workers; None = derive from the machine.
+ADMISSION_MEMORY_MB = None
+ADMISSION_MEMORY_FRACTION = 0.7  # of physical RAM when ADMISSION_MEMORY_MB is None
+ADMISSION_CPU_SLOTS = None  # concurrent jobs; None = CPU count
+ADMISSION_QUEUE_TIMEOUT = 30  # seconds a request may wait for capacity
+ADMISSION_MAX_RETRY_AFTER = 600
+ADMISSION_UNKNOWN_DURATION = 60  # assumed when the container has no frame count
+# Cost model, fitted on measured 640x480..1920x1080 runs
+ADMISSION_CPU_PER_FRAME_S = 0.04  # segmentation, flow and pose per analysed frame
+ADMISSION_CPU_PER_MPX_S = 0.008  # decode and resize per decoded megapixel
+ADMISSION_CPU_PER_AUDIO_S = 0.3  # synthesis per second of audio
+ADMISSION_BASE_MB = 280  # engine stack, GL block buffers, hot histories
+ADMISSION_MB_PER_MPX = 20
+ADMISSION_MB_PER_AUDIO_S = 2.5
+ADMISSION_ALL_MODES_FACTOR = 2.0  # audio cost multiplier when every mode is rendered
+# Sample library (engine/samples.py): previews and thumbnails are cached here
+SAMPLES_DIR = "Samples"
+SAMPLE_CACHE_DIR = "sample_cache"
+SAMPLE_PRECOMPUTE = True  # build previews in the background after each rescan
+SAMPLE_PREVIEW_HEIGHT = 240
+SAMPLE_PREVIEW_SECONDS = 10
+SAMPLE_PREVIEW_CRF = 30
+SAMPLE_THUMB_WIDTH = 320
+SAMPLE_THUMB_QUALITY = 75
+SAMPLE_CACHE_MAX_AGE = 7 * 24 * 3600  # asset URLs carry a version, so they can be cached long
 # Max video duration in seconds for local processing (None = no limit)
 MAX_VIDEO_DURATION_LOCAL = None
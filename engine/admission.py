@@ -0,0 +1,220 @@
+# engine/admission.py
+import os
+import time
+import atexit
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows, where gunicorn does not run: one process serves
+    fcntl = None
+
+# Reservations live in shared memory created at import. With gunicorn's
+# preload_app the master imports this before forking, so every worker sees
+# one global budget; a single-process server simply has its own.
+MAX_JOBS = 64
+FIELDS = 5  # pid, state, mem_mb, cpu_s, t (enqueued or started)
+FREE, WAITING, RUNNING = 0, 1, 2
+POLL_S = 0.25
+
+
+
+class _FileLock:
+    # Exclusive lock across processes and threads. A worker that gunicorn
+    # kills on timeout while holding a multiprocessing.Lock would keep it
+    # forever; an flock is dropped by the kernel when its holder dies. flock
+    # belongs to the open file, which fork shares, so every process reopens
+    # the file, and threads of one process take a thread lock first.
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix='camsynth-admission-', suffix='.lock')
+        os.close(fd)
+        self.owner = os.getpid()
+        self._reopen()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reopen)
+        atexit.register(self._remove)
+
+    def _reopen(self):
+        self.fd = os.open(self.path, os.O_RDWR)
+        self.threads = threading.Lock()
+
+    def _remove(self):
+        if os.getpid() == self.owner:
+            with contextlib.suppress(OSError):
+                os.remove(self.path)
+
+    def __enter__(self):
+        self.threads.acquire()
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except BaseException:
+            self.threads.release()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.threads.release()
+
+
+_lock = _FileLock() if fcntl is not None else threading.Lock()
+_slots = multiprocessing.RawArray('d', MAX_JOBS * FIELDS)
+
+
+class Overloaded(Exception):
+    # retry_after is None when the job can never fit the budget
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def physical_memory_mb():
+    if hasattr(os, 'sysconf'):
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2 ** 20
+    if os.name == 'nt':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+        status = MemoryStatus(dwLength=ctypes.sizeof(MemoryStatus))
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys / 2 ** 20
+    raise RuntimeError("Cannot read physical memory on this platform; set ADMISSION_MEMORY_MB in config.py")
+
+
+def memory_budget_mb():
+    if config.ADMISSION_MEMORY_MB:
+        return float(config.ADMISSION_MEMORY_MB)
+    return physical_memory_mb() * config.ADMISSION_MEMORY_FRACTION
+
+
+def cpu_budget():
+    return config.ADMISSION_CPU_SLOTS or os.cpu_count() or 1
+
+
+def estimate_cost(probe, all_modes=False):
+    # Returns (cpu seconds, peak MB) for one process_video job. Coefficients
+    # are in config and were fitted on measured runs; histories are bounded
+    # by HISTORY_WINDOW, so memory grows with the audio buffers and decoded
+    # frame size, CPU with analysed frames, decoded pixels and audio length.
+    duration = probe['duration'] or config.ADMISSION_UNKNOWN_DURATION
+    src_mpx = probe['width'] * probe['height'] / 1e6
+    analysed = duration * min(probe['fps'], config.ANALYSIS_FPS or probe['fps'])
+    decoded = duration * probe['fps']
+    audio_s = duration * (config.ADMISSION_ALL_MODES_FACTOR if all_modes else 1.0)
+
+    cpu = (analysed * config.ADMISSION_CPU_PER_FRAME_S
+           + decoded * src_mpx * config.ADMISSION_CPU_PER_MPX_S
+           + audio_s * config.ADMISSION_CPU_PER_AUDIO_S)
+    mem = (config.ADMISSION_BASE_MB
+           + src_mpx * config.ADMISSION_MB_PER_MPX
+           + audio_s * config.ADMISSION_MB_PER_AUDIO_S)
+    return cpu, mem
+
+
+def _alive(pid):
+    # The caller is alive by definition. This also keeps os.kill, which on
+    # Windows terminates rather than probes, away from the only pid there.
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _jobs():
+    # (index, pid, state, mem, cpu, t) for occupied slots; slots of workers
+    # that died holding a reservation are released. Caller holds _lock.
+    out = []
+    for i in range(MAX_JOBS):
+        base = i * FIELDS
+        if _slots[base + 1] == FREE:
+            continue
+        pid = int(_slots[base])
+        if not _alive(pid):
+            _slots[base + 1] = FREE
+            continue
+        out.append((i, pid) + tuple(_slots[base + 1:base + FIELDS]))
+    return out
+
+
+def _retry_after(jobs, now, extra_cpu=0.0):
+    # Outstanding CPU work spread over the CPU slots
+    remaining = extra_cpu
+    for _, _, state, _, cpu, t in jobs:
+        remaining += max(1.0, cpu - (now - t)) if state == RUNNING else cpu
+    return int(min(config.ADMISSION_MAX_RETRY_AFTER, max(1, remaining / cpu_budget())))
+
+
+def load():
+    with _lock:
+        jobs = _jobs()
+    now = time.time()
+    running = [j for j in jobs if j[2] == RUNNING]
+    return {
+        'running': len(running),
+        'queued': len(jobs) - len(running),
+        'cpu_slots': cpu_budget(),
+        'memory_mb': round(sum(j[3] for j in running)),
+        'memory_budget_mb': round(memory_budget_mb()),
+        'backlog_cpu_s': round(sum(j[4] for j in jobs if j[2] == WAITING)
+                               + sum(max(0.0, j[4] - (now - j[5])) for j in running)),
+        'retry_after': _retry_after(jobs, now) if jobs else 0
+    }
+
+
+@contextlib.contextmanager
+def admit(cost, timeout=None):
+    # Reserve (cpu, mem) for the duration of the block. Jobs start in arrival
+    # order when a CPU slot and enough memory are free; a job that cannot
+    # start within `timeout` seconds, or whose expected wait already exceeds
+    # it, raises Overloaded with a Retry-After estimate.
+    cpu, mem = cost
+    timeout = config.ADMISSION_QUEUE_TIMEOUT if timeout is None else timeout
+    budget = memory_budget_mb()
+    if mem > budget:
+        raise Overloaded(f"Job needs ~{mem:.0f} MB, over the {budget:.0f} MB budget")
+
+    with _lock:
+        jobs = _jobs()
+        now = time.time()
+        busy = sum(1 for j in jobs if j[2] == RUNNING) >= cpu_budget()
+        if len(jobs) >= MAX_JOBS or (busy and _retry_after(jobs, now) > timeout):
+            raise Overloaded("Server is busy", _retry_after(jobs, now, cpu))
+        slot = next(i for i in range(MAX_JOBS) if _slots[i * FIELDS + 1] == FREE)
+        _slots[slot * FIELDS:(slot + 1) * FIELDS] = [os.getpid(), WAITING, mem, cpu, now]
+
+    deadline = now + timeout
+    try:
+        while True:
+            with _lock:
+                jobs = _jobs()
+                now = time.time()
+                running = [j for j in jobs if j[2] == RUNNING]
+                first = min((j[5], j[0]) for j in jobs if j[2] == WAITING)[1]
+                if (first == slot and len(running) < cpu_budget()
+                        and sum(j[3] for j in running) + mem <= budget):
+                    _slots[slot * FIELDS + 1] = RUNNING
+                    _slots[slot * FIELDS + 4] = now
+                    break
+                if now >= deadline:
+                    raise Overloaded("Server is busy", _retry_after(jobs, now))
+            time.sleep(POLL_S)
+        yield
+    finally:
+        with _lock:
+            _slots[slot * FIELDS + 1] = FREE
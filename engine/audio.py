@@ -1,27 +1,38 @@
 # engine/audio.py
 import numpy as np
-import librosa
 import soundfile as sf
-import scipy.ndimage
 import os
+import shutil
+import subprocess
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import config
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-
-# Ensure ffmpeg is available via imageio-ffmpeg (downloads binary if needed)
-try:
-    import imageio_ffmpeg
-    # This will download ffmpeg binary if not already present
-    ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-    # Set environment variable so moviepy can find it
-    os.environ['IMAGEIO_FFMPEG_EXE'] = ffmpeg_exe
-except Exception as e:
-    print(f"Warning: Could not initialize ffmpeg via imageio-ffmpeg: {e}")
-    print("Please install ffmpeg system-wide or ensure imageio-ffmpeg can download it.")
-
-from moviepy.editor import VideoFileClip, AudioFileClip
-from moviepy.video.fx.all import speedx
+from engine import effects, oscillators
+from engine.spectrogram import save_spectrogram_png
+
+# librosa and scipy together take seconds to import, so they are
+# imported where they are used rather than at module load.
+
+MODES = ("fm", "rhythmic", "granular", "harmonic", "doppler_fm", "ambient")
+SHAPE_HALO = 8  # radius of the widest time-axis gaussian (sigma=2, truncate=4)
+GL_MOMENTUM = 0.99
+MAX_HOP = config.N_FFT // 4  # keep at least 75% window overlap
+
+@functools.lru_cache(maxsize=None)
+def get_ffmpeg_exe():
+    # Resolved once per process. Prefer an explicit or system ffmpeg so an
+    # offline box never depends on imageio-ffmpeg's bundled download.
+    exe = os.environ.get('IMAGEIO_FFMPEG_EXE') or shutil.which('ffmpeg')
+    if not exe:
+        try:
+            import imageio_ffmpeg
+            exe = imageio_ffmpeg.get_ffmpeg_exe()
+        except Exception as e:
+            print(f"Warning: Could not initialize ffmpeg via imageio-ffmpeg: {e}")
+            print("Please install ffmpeg system-wide or ensure imageio-ffmpeg can download it.")
+            return None
+    return exe
 
 class AudioEngine:
     def __init__(self):
@@ -51,80 +62,28 @@ class AudioEngine:
                     mask[start:end] = 1.0
         return mask
 
-    def _add_reverb(self, audio, delay_s=0.3, decay=0.5):
-        delay_samples = int(self.sr * delay_s)
-        if delay_samples >= len(audio):
-            return audio
-        output = audio.copy()
-        output[delay_samples:] += output[:-delay_samples] * decay
-        return output
+    def _add_reverb(self, audio, delay_s=0.3, decay=0.5, out=None):
+        return effects.reverb(audio, self.sr, delay_s=delay_s, decay=decay, out=out)
 
     def _granular_process(self, audio, grain_ms=50, overlap=0.5):
-        n = len(audio)
-        grain_len = max(10, int(self.sr * grain_ms * 0.001))
-        step = max(1, int(grain_len * (1.0 - overlap)))
-        
-        if grain_len >= n:
-            return audio
-
-        grain_starts = np.arange(0, n - grain_len, step)
-        grains = np.array([audio[i:i+grain_len] for i in grain_starts])
-        window = np.hanning(grain_len)
-        grains *= window
-
-        np.random.shuffle(grains)
-        out = np.zeros(n, dtype=audio.dtype)
-        for i, grain in enumerate(grains):
-            pos = i * step
-            end = min(pos + grain_len, n)
-            out[pos:end] += grain[:end-pos]
-
-        max_val = np.max(np.abs(out))
-        return (out / (max_val + 1e-6)) * 0.9 if max_val > 0 else out
+        return effects.granular(audio, self.sr, grain_ms=grain_ms, overlap=overlap)
 
     def _rhythmic_gate(self, audio, motion_curve):
-        m_smooth = scipy.ndimage.gaussian_filter1d(
-            motion_curve, sigma=max(1, len(motion_curve) // 200)
-        )
-        threshold = np.mean(m_smooth) + 0.5 * np.std(m_smooth)
-        peaks = np.where(
-            (m_smooth[1:-1] > m_smooth[:-2]) &
-            (m_smooth[1:-1] > m_smooth[2:]) &
-            (m_smooth[1:-1] > threshold)
-        )[0] + 1
-
-        env = np.full(len(audio), 0.15, dtype=np.float32)
-        width = int(0.06 * self.sr)
-        motion_len = len(motion_curve)
-        audio_len = len(audio)
-        
-        for p in peaks:
-            center = int(p * audio_len / motion_len)
-            start = max(0, center - width)
-            end = min(audio_len, center + width)
-            indices = np.arange(start, end)
-            env[indices] = np.maximum(env[indices], 1.0 - np.abs(indices - center) / width)
-        
-        return audio * env
+        return effects.rhythmic_gate(audio, motion_curve, self.sr)
 
     def _fm_synth(self, duration, scale, motion_curve, torso_activity, spread):
-        n = int(duration * self.sr)
-        t = np.linspace(0.0, duration, n, endpoint=False)
+        n = int(round(duration * self.sr))
         base_freq = scale[len(scale)//2] if scale else 220.0
-        two_pi = 2.0 * np.pi
+        depth = np.float32(2.0 * (1.0 + min(torso_activity * 50, 4.0)) * (1.0 + spread))
 
-        m = np.interp(
-            np.linspace(0, 1, n),
-            np.linspace(0, 1, len(motion_curve)),
-            motion_curve
-        )
+        def index(start, end):
+            m = oscillators.control(motion_curve, start, end, n)
+            m *= depth
+            return m
 
-        index = 2.0 * m * (1.0 + min(torso_activity * 50, 4.0)) * (1.0 + spread)
-        mod = np.sin(two_pi * (base_freq * 2) * t)
-        y = np.sin(two_pi * base_freq * t + index * mod) * np.hanning(n)
-
-        max_val = np.max(np.abs(y))
-        return (y / (max_val + 1e-6)) * 0.9 if max_val > 0 else y
+        out = np.empty(n, dtype=np.float32)
+        out, peak = oscillators.fm(out, self.sr, base_freq, index)
+        return oscillators.normalize(out, peak)
     
     def _harmonic_arpeggios(self, duration, scale, motion_curve):
         n = int(duration * self.sr)
@@ -139,7 +98,7 @@ class AudioEngine:
         indices = (phase / 2).astype(int) % len(freqs)
         current_freqs = freqs[indices]
         
-        y = np.array([np.sin(two_pi * current_freqs[i] * t[i]) for i in range(n)], dtype=np.float32)
+        y = np.sin(two_pi * current_freqs * t).astype(np.float32)
         envelope = np.hanning(n) * (0.3 + 0.7 * m)
         y *= envelope
         
@@ -147,169 +106,236 @@ class AudioEngine:
         return (y / (max_val + 1e-6)) * 0.9 if max_val > 0 else y
     
     def _doppler_fm_synth(self, duration, scale, motion_curve, spin_intensity):
-        n = int(duration * self.sr)
-        t = np.linspace(0.0, duration, n, endpoint=False)
+        n = int(round(duration * self.sr))
         base_freq = scale[len(scale)//2] if scale else 220.0
-        two_pi = 2.0 * np.pi
-        
-        m = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(motion_curve)), motion_curve)
-        doppler_freq = base_freq * (1.0 + spin_intensity * np.sin(two_pi * 0.5 * t))
-        index = 2.0 * m * (1.0 + spin_intensity * 2.0)
-        mod = np.sin(two_pi * (doppler_freq * 2) * t)
-        y = np.sin(two_pi * doppler_freq * t + index * mod) * np.hanning(n)
-        
-        max_val = np.max(np.abs(y))
-        return (y / (max_val + 1e-6)) * 0.9 if max_val > 0 else y
-
-    def _classify_mode(self, motion_hist, pose_hist, gesture=None):
-        if gesture:
-            gesture_map = {
-                "wave": "granular",
-                "spin": "doppler_fm",
-                "raise_arms": "harmonic",
-                "stillness": "ambient",
-                "jump": "rhythmic"
-            }
-            if gesture in gesture_map:
-                return gesture_map[gesture]
-        
-        if not motion_hist:
-            return "ambient"
-
-        m = np.array(motion_hist, dtype=np.float32)
-        high_ratio = np.mean(m > 0.6)
-        low_ratio = np.mean(m < 0.2)
-        var_m = np.var(m)
-        mean_m = np.mean(m)
-
-        all_spreads = []
-        torso_deltas = []
-        prev_torsos = None
-
-        for frame in pose_hist:
-            if not frame:
-                continue
-                
-            frame_arr = np.array(frame)
-            spreads = np.abs(np.clip(frame_arr[:, 2], 0, 1) - np.clip(frame_arr[:, 0], 0, 1))
-            all_spreads.extend(spreads.tolist())
-
-            # Torso tracking
-            current_torsos = sorted([(f[5], f[4]) for f in frame], key=lambda x: x[0])
-            if prev_torsos:
-                count = min(len(prev_torsos), len(current_torsos))
-                if count > 0:
-                    deltas = np.abs(np.array([current_torsos[i][1] for i in range(count)]) - 
-                                   np.array([prev_torsos[i][1] for i in range(count)]))
-                    torso_deltas.append(float(np.mean(deltas)))
-            prev_torsos = current_torsos
-
-        torso_act = np.mean(torso_deltas) if torso_deltas else 0.0
-        avg_spread = np.mean(all_spreads) if all_spreads else 0.3
-
-        if high_ratio > 0.4 and var_m > 0.02:
-            return "fm" if (torso_act > 0.03 and avg_spread > 0.4) else "rhythmic"
-        if avg_spread > 0.5:
-            return "granular"
-        if mean_m < 0.2 and low_ratio > 0.5:
-            return "ambient"
-
-        return "ambient"
-
-    def generate(self, collector, total_time):
-
-        spectral_hist = collector.spectral_hist
-        mod_hist = collector.mod_hist
-        motion_hist = collector.motion_hist
-        pose_hist = collector.pose_hist
-
-        if not spectral_hist:
-            raise RuntimeError("No spectral data collected for audio synthesis.")
-
-        spectral_array = np.array([s for s in spectral_hist]).transpose(1, 2, 0)  # (3, N_BINS, frames)
+        depth = np.float32(2.0 * (1.0 + spin_intensity * 2.0))
+        # Carrier swings +/-spin_intensity around base_freq at 0.5 Hz; the
+        # oscillator integrates it, so the pitch follows the sweep exactly.
+        lfo_rad = 2.0 * np.pi * 0.5 * self.sr_inv
+
+        def freq(start, end):
+            lfo = np.sin(oscillators.wrap(np.arange(start, end, dtype=np.float64) * lfo_rad))
+            lfo *= np.float32(spin_intensity * base_freq)
+            lfo += np.float32(base_freq)
+            return lfo
+
+        def index(start, end):
+            m = oscillators.control(motion_curve, start, end, n)
+            m *= depth
+            return m
+
+        out = np.empty(n, dtype=np.float32)
+        out, peak = oscillators.fm(out, self.sr, freq, index)
+        return oscillators.normalize(out, peak)
+
+    def _shape_block(self, spectral_hist, mod_hist, pose_hist, start, end):
+        import scipy.ndimage
+        # The time-axis gaussian needs SHAPE_HALO neighbouring columns on each
+        # side to give the same result as filtering the whole session at once.
+        lo = max(0, start - SHAPE_HALO)
+        hi = min(len(spectral_hist), end + SHAPE_HALO)
+        spectral_array = np.array(spectral_hist[lo:hi], dtype=np.float32).transpose(1, 2, 0)  # (3, N_BINS, frames)
         sigmas = [(2, 2), (1, 2), (0.5, 1)]
         S_layers = [
-            scipy.ndimage.gaussian_filter(spectral_array[i], sigma=sig)
+            scipy.ndimage.gaussian_filter(spectral_array[i], sigma=sig)[:, start - lo:end - lo]
             for i, sig in enumerate(sigmas)
         ]
         S_low, S_mid, S_high = S_layers
 
-        n_frames = S_low.shape[1]
         factors_base = np.array([1.2, 1.0, 0.3])
-        
-        for t in range(n_frames):
+
+        for j, t in enumerate(range(start, end)):
             cx, cy, speed = mod_hist[t]
             mask = self._create_dynamic_mask(self._pick_scale(cx), richness=speed)
             factors = factors_base + np.array([0, 0, speed])
 
             for S, factor in zip([S_low, S_mid, S_high], factors):
-                S[:, t] *= mask * factor
+                S[:, j] *= mask * factor
                 cutoff = int(self.n_bins * (1.0 - cy * 0.8))
                 if cutoff < self.n_bins:
-                    S[cutoff:, t] = 0
+                    S[cutoff:, j] = 0
 
             if t < len(pose_hist) and pose_hist[t]:
                 feats = np.array(pose_hist[t])
                 h_avg = np.mean((2 - feats[:, 1] - feats[:, 3]) / 2)
                 s_avg = np.mean(np.abs(feats[:, 2] - feats[:, 0]))
-                S_mid[:, t] *= (0.9 + 0.3 * s_avg)
-                S_low[:, t] *= (1.1 - 0.5 * h_avg)
-
-        S_total = np.log1p(sum([S_low, S_mid, S_high]) + 1e-6)
-        if S_total.max() > 0:
-            S_total = S_total / S_total.max() * 60.0
-        
-        self.final_spectrogram = S_total.copy()
-
-        raw = librosa.griffinlim(S_total, n_fft=self.n_fft, hop_length=config.HOP_LEN)
-        curr_dur = len(raw) * self.sr_inv
-        audio = librosa.effects.time_stretch(raw, rate=curr_dur / total_time) if total_time > 0 else raw
-
-        gesture = getattr(collector, 'current_gesture', None)
-        mode = self._classify_mode(motion_hist, pose_hist, gesture)
-
-        m_interp = np.interp(
-            np.linspace(0, 1, len(audio)),
-            np.linspace(0, 1, len(motion_hist)),
-            np.clip(motion_hist, 0, 1)
-        )
-
-        torso_deltas = []
-        prev = None
-        for frame in pose_hist:
-            if not frame:
-                continue
-            cur = sorted([(f[5], f[4]) for f in frame], key=lambda x: x[0])
-            if prev and len(prev) == len(cur):
-                deltas = np.abs(np.array([c[1] for c in cur]) - np.array([p[1] for p in prev]))
-                torso_deltas.append(float(np.mean(deltas)))
-            prev = cur
-        torso_act = np.mean(torso_deltas) if torso_deltas else 0.0
-
-        if pose_hist:
-            spreads = [abs(np.clip(f[2], 0, 1) - np.clip(f[0], 0, 1)) for frame in pose_hist for f in frame]
-            avg_spread = np.mean(spreads) if spreads else 0.3
+                S_mid[:, j] *= (0.9 + 0.3 * s_avg)
+                S_low[:, j] *= (1.1 - 0.5 * h_avg)
+
+        S_low += S_mid
+        S_low += S_high
+        S_low += 1e-6
+        return np.log1p(S_low, out=S_low)
+
+    def _shape_spectrogram(self, spectral_hist, mod_hist, pose_hist):
+        n_frames = len(spectral_hist)
+        block = config.GL_BLOCK_FRAMES
+
+        # Long sessions keep the shaped spectrogram in an anonymous temp file
+        # so only one block of columns is resident at a time.
+        if n_frames > block:
+            S_total = np.memmap(tempfile.TemporaryFile(), dtype=np.float32,
+                                mode='w+', shape=(self.n_bins, n_frames))
         else:
-            avg_spread = 0.3
-            
-        mean_cx = np.mean([m[0] for m in mod_hist]) if mod_hist else 0.5
+            S_total = np.empty((self.n_bins, n_frames), dtype=np.float32)
+
+        peak = 0.0
+        for start in range(0, n_frames, block):
+            end = min(n_frames, start + block)
+            S_total[:, start:end] = self._shape_block(spectral_hist, mod_hist, pose_hist, start, end)
+            peak = max(peak, float(S_total[:, start:end].max()))
+
+        if peak > 0:
+            for start in range(0, n_frames, block):
+                S_total[:, start:block + start] *= 60.0 / peak
+        return S_total
+
+    def _griffinlim(self, S, hop, init_angles=None, n_pinned=0, length=None):
+        import librosa
+        angles = np.exp(2j * np.pi * np.random.random_sample(S.shape)).astype(np.complex64)
+        if init_angles is not None:
+            angles[:, :init_angles.shape[1]] = init_angles
+
+        rebuilt = None
+        for _ in range(config.GL_N_ITER):
+            inverse = librosa.istft(S * angles, hop_length=hop, n_fft=self.n_fft)
+            tprev, rebuilt = rebuilt, librosa.stft(inverse, n_fft=self.n_fft, hop_length=hop)
+            angles[:] = rebuilt
+            if tprev is not None:
+                angles -= (GL_MOMENTUM / (1 + GL_MOMENTUM)) * tprev
+            angles /= np.abs(angles) + 1e-10
+            # Columns already settled by the previous block keep their phase
+            # so both sides of a seam agree.
+            if n_pinned:
+                angles[:, :n_pinned] = init_angles[:, :n_pinned]
+
+        return librosa.istft(S * angles, hop_length=hop, n_fft=self.n_fft, length=length), angles
+
+    def _frame_hop(self, n_frames, total_time):
+        # One spectrogram column per video frame means a hop of sr / fps. The
+        # STFT needs an integer hop of at most MAX_HOP, so pick one and resample
+        # the frame timeline to however many columns fill total_time exactly.
+        if total_time <= 0:
+            return config.HOP_LEN, n_frames
+        target = self.sr * total_time / n_frames
+        hop = int(round(target / int(np.ceil(target / MAX_HOP))))
+        n_cols = max(1, int(round(total_time * self.sr / hop)))
+        return hop, n_cols
+
+    def _reconstruct(self, S_total, total_time):
+        # Griffin-Lim over overlapping column blocks. Each block starts from the
+        # previous block's phase in the shared columns and the two outputs are
+        # crossfaded there, so memory depends on the block size, not the session.
+        n_frames = S_total.shape[1]
+        hop, n_cols = self._frame_hop(n_frames, total_time)
+        block = config.GL_BLOCK_FRAMES
+        overlap = config.GL_BLOCK_OVERLAP
+
+        out_len = int(round(total_time * self.sr)) if total_time > 0 else n_cols * hop
+        audio = np.zeros(max(out_len, n_cols * hop), dtype=np.float32)
+
+        fade_len = 2 * overlap * hop
+        fade_in = np.linspace(0.0, 1.0, fade_len, dtype=np.float32)
+        prev_angles = None
+        start = 0
+        while True:
+            end = min(n_cols, start + block)
+            a = max(0, start - overlap)
+            b = min(n_cols, end + overlap)
+            last = b == n_cols
+
+            if n_cols == n_frames:
+                S_blk = np.asarray(S_total[:, a:b])
+            else:
+                S_blk = S_total[:, (np.arange(a, b) * n_frames) // n_cols]
+
+            y, angles = self._griffinlim(
+                S_blk, hop,
+                init_angles=prev_angles,
+                n_pinned=overlap if prev_angles is not None else 0,
+                length=(b - a) * hop
+            )
+            if prev_angles is not None:
+                y[:fade_len] *= fade_in
+            if not last:
+                y[-fade_len:] *= fade_in[::-1]
+                prev_angles = angles[:, end - overlap - a:]
+
+            audio[a * hop:b * hop] += y
+
+            if last:
+                break
+            start = end
+
+        return audio[:out_len]
+
+    def _prepare(self, collector, total_time):
+        # Everything the mode renderers share: the Griffin-Lim reconstruction
+        # and the control curves derived from the session.
+        spectral_hist = collector.spectral_hist
+        mod_hist = collector.mod_hist
+        motion_hist = collector.motion_hist
+        pose_hist = collector.pose_hist
+
+        if not spectral_hist:
+            raise RuntimeError("No spectral data collected for audio synthesis.")
+
+        S_total = self._shape_spectrogram(spectral_hist, mod_hist, pose_hist)
+        self.final_spectrogram = S_total
+        audio = self._reconstruct(S_total, total_time)
+
+        mode = collector.session_mode()
+
+        # The motion curve stretched to audio rate, which the modes read per
+        # sample. Built block by block in float32, so it costs the same as
+        # the waveform and needs no full-length float64 temporaries; it and
+        # the waveform are the buffers that grow with the session, while the
+        # shaped spectrogram spills to disk.
+        motion = np.clip(np.asarray(motion_hist, dtype=np.float32), 0, 1)
+        m_interp = np.empty(len(audio), dtype=np.float32)
+        for start in range(0, len(audio), oscillators.BLOCK):
+            end = min(len(audio), start + oscillators.BLOCK)
+            m_interp[start:end] = oscillators.control(motion, start, end, len(audio))
+
+        torso_act = collector.classifier.torso_act
+        avg_spread = collector.classifier.avg_spread
+        mean_cx = float(np.asarray(mod_hist)[:, 0].mean()) if mod_hist else 0.5
+
+        return {
+            'audio': audio,
+            'mode': mode,
+            'm_interp': m_interp,
+            'torso_act': torso_act,
+            'avg_spread': avg_spread,
+            'mean_cx': mean_cx
+        }
+
+    def _render_mode(self, mode, base):
+        # Never modifies base['audio'], so several modes can share one base.
+        audio = base['audio']
+        m_interp = base['m_interp']
+        torso_act = base['torso_act']
+        mean_cx = base['mean_cx']
 
         if mode == "fm":
             fm = self._fm_synth(len(audio) * self.sr_inv,
                                 self._pick_scale(mean_cx),
                                 m_interp,
                                 torso_act,
-                                avg_spread)
-            fm = fm[:len(audio)]
-            mixed = audio * 0.6 + fm * 0.6
-            max_mixed = np.max(np.abs(mixed))
-            final = self._add_reverb((mixed / (max_mixed + 1e-6)) * 0.9)
+                                base['avg_spread'])
+            # Mixed in place in the synth's buffer: 0.6 * (audio + fm)
+            mixed = fm[:len(audio)]
+            mixed += audio
+            mixed = oscillators.normalize(mixed, np.max(np.abs(mixed)))
+            final = self._add_reverb(mixed, out=mixed)
 
         elif mode == "rhythmic":
-            final = self._add_reverb(self._rhythmic_gate(audio, m_interp), delay_s=0.2)
+            gated = self._rhythmic_gate(audio, m_interp)
+            final = self._add_reverb(gated, delay_s=0.2, out=gated)
 
         elif mode == "granular":
-            final = self._add_reverb(self._granular_process(audio), delay_s=0.4)
+            grains = self._granular_process(audio)
+            final = self._add_reverb(grains, delay_s=0.4, out=grains)
         
         elif mode == "harmonic":
             harmonic = self._harmonic_arpeggios(len(audio) * self.sr_inv, self._pick_scale(mean_cx), m_interp)
@@ -321,62 +347,73 @@ class AudioEngine:
         elif mode == "doppler_fm":
             spin_intensity = min(torso_act * 10, 1.0)
             doppler = self._doppler_fm_synth(len(audio) * self.sr_inv, self._pick_scale(mean_cx), m_interp, spin_intensity)
-            doppler = doppler[:len(audio)]
-            mixed = audio * 0.5 + doppler * 0.7
-            max_mixed = np.max(np.abs(mixed))
-            final = self._add_reverb((mixed / (max_mixed + 1e-6)) * 0.9, delay_s=0.25)
+            # 0.5 * audio + 0.7 * doppler, in place in the synth's buffer
+            mixed = doppler[:len(audio)]
+            mixed *= 1.4
+            mixed += audio
+            mixed = oscillators.normalize(mixed, np.max(np.abs(mixed)))
+            final = self._add_reverb(mixed, delay_s=0.25, out=mixed)
 
         else:
             final = self._add_reverb(audio, delay_s=0.5)
 
-        sf.write("temp_audio.wav", final, self.sr)
-        return "temp_audio.wav"
+        return final
+
+    def generate(self, collector, total_time):
+        # Returns (float32 mono audio, sample rate). The audio is handed over
+        # in memory rather than through a shared temp file, so concurrent jobs
+        # cannot clobber each other's audio; only the shaped spectrogram of a
+        # long session spills to an anonymous temp memmap.
+        base = self._prepare(collector, total_time)
+        self.mode = base['mode']
+        return self._render_mode(base['mode'], base), self.sr
+
+    def generate_all_modes(self, collector, total_time, track_path):
+        # One reconstruction, then every mode rendered concurrently and written
+        # to track_path(mode) for auditioning. Returns
+        # ({mode: path}, audio of self.mode), self.mode being the mode the
+        # classifier picked; only that buffer is kept in memory.
+        base = self._prepare(collector, total_time)
+        self.mode = base['mode']
+
+        def render(mode):
+            audio = self._render_mode(mode, base)
+            path = track_path(mode)
+            sf.write(path, audio, self.sr)
+            return path, (audio if mode == self.mode else None)
+
+        with ThreadPoolExecutor(max_workers=config.MODE_PREVIEW_WORKERS) as pool:
+            results = dict(zip(MODES, pool.map(render, MODES)))
+        return {mode: path for mode, (path, _) in results.items()}, results[self.mode][1]
     
     def save_spectrogram(self, output_path):
         if not hasattr(self, 'final_spectrogram') or self.final_spectrogram is None:
             return None
-        
-        S = self.final_spectrogram
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        im = ax.imshow(S, aspect='auto', origin='lower', cmap='viridis', interpolation='bilinear')
-        plt.colorbar(im, ax=ax, label='Magnitude (dB)')
-        ax.set_xlabel('Time (frames)')
-        ax.set_ylabel('Frequency (bins)')
-        ax.set_title('Motion-to-Sound Spectrogram')
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=100, bbox_inches='tight')
-        plt.close(fig)
-        
-        return output_path
+        return save_spectrogram_png(self.final_spectrogram, output_path)
 
-    def merge_video(self, video_path, audio_path, output_path, total_time):
+    def merge_video(self, video_path, audio, output_path, total_time):
+        # Muxes an in-memory float32 buffer (at self.sr) with the rendered
+        # video: the PCM is piped to ffmpeg on stdin, no audio file involved.
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
-        
-        clip_v = VideoFileClip(video_path)
-        clip_a = AudioFileClip(audio_path)
-        
-        # Adjust video speed to match audio duration
-        video_duration = clip_v.duration
-        if video_duration > 0 and abs(video_duration - total_time) > 0.1:  # Only adjust if significantly different
-            speed_factor = video_duration / total_time
-            clip_v = speedx(clip_v, speed_factor)
-        
-        # Ensure video duration matches exactly
-        if clip_v.duration > total_time:
-            clip_v = clip_v.subclip(0, total_time)
-        elif clip_v.duration < total_time:
-            # If video is shorter, loop it or extend last frame (simple: just use as is)
-            pass
-        
-        # Combine video and audio
-        final_clip = clip_v.set_audio(clip_a)
-        final_clip.write_videofile(output_path, codec='libx264', audio_codec='aac', logger=None, verbose=False)
-        
-        # Clean up
-        clip_v.close()
-        clip_a.close()
-        final_clip.close()
+        ffmpeg = get_ffmpeg_exe()
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg is not available")
+
+        pcm = memoryview(np.ascontiguousarray(audio, dtype='<f4')).cast('B')
+        # Audio is synthesized at the video frame rate, so the two only differ
+        # by container rounding; trim to total_time rather than retime.
+        cmd = [
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-i', video_path,
+            '-f', 'f32le', '-ar', str(self.sr), '-ac', '1', '-i', 'pipe:0',
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac',
+            '-t', f"{total_time:.6f}", '-shortest',
+            output_path
+        ]
+        proc = subprocess.run(cmd, input=pcm, capture_output=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode(errors='replace').strip()}")
+        return output_path
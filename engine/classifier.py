@@ -0,0 +1,227 @@
+# engine/classifier.py
+import math
+from collections import deque
+import config
+
+GESTURE_MODES = {
+    "wave": "granular",
+    "spin": "doppler_fm",
+    "raise_arms": "harmonic",
+    "stillness": "ambient",
+    "jump": "rhythmic"
+}
+
+# Gesture thresholds. Distances are in shoulder widths so they hold for any
+# distance from the camera.
+STILL_ENERGY = 0.03  # motion energy below which a frame counts as still
+STILL_SHARE = 0.9  # of the window
+RAISE_MARGIN = 0.3  # wrists this far above the shoulders
+RAISE_SHARE = 0.6
+WAVE_SWING = 0.25  # horizontal wrist travel that counts as one stroke
+WAVE_REVERSALS = 3  # direction changes of a raised wrist within the window
+SPIN_TURN = 0.75 * math.pi  # shoulder-line rotation summed over the window
+SPIN_JITTER = 0.03  # per-frame rotation ignored as landmark noise
+JUMP_LAG = 6  # frames over which the shoulders must rise
+JUMP_RISE = 0.5
+
+
+class RunningStats:
+    # Welford's running mean and variance
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    @property
+    def var(self):
+        return self.m2 / self.n if self.n else 0.0
+
+
+class ModeClassifier:
+    # Session statistics behind the synthesis mode, updated once per frame so
+    # the mode can be read at any time without rescanning the histories.
+
+    def __init__(self):
+        self.motion = RunningStats()
+        self.high = 0
+        self.low = 0
+        self.spread = RunningStats()
+        # Mean shoulder-angle change between consecutive frames with people.
+        # The classifier compares as many people as both frames have; the
+        # synth intensity only frames whose head count did not change.
+        self.torso = RunningStats()
+        self.torso_paired = RunningStats()
+        self.prev_torsos = None
+
+    def update(self, energy, frame_feats):
+        self.motion.add(energy)
+        self.high += energy > 0.6
+        self.low += energy < 0.2
+        if not frame_feats:
+            return
+
+        for f in frame_feats:
+            self.spread.add(abs(min(max(f[2], 0.0), 1.0) - min(max(f[0], 0.0), 1.0)))
+
+        torsos = sorted((f[5], f[4]) for f in frame_feats)
+        prev = self.prev_torsos
+        if prev:
+            count = min(len(prev), len(torsos))
+            delta = sum(abs(torsos[i][1] - prev[i][1]) for i in range(count)) / count
+            self.torso.add(delta)
+            if len(prev) == len(torsos):
+                self.torso_paired.add(delta)
+        self.prev_torsos = torsos
+
+    @property
+    def torso_act(self):
+        return self.torso_paired.mean
+
+    @property
+    def avg_spread(self):
+        return self.spread.mean if self.spread.n else 0.3
+
+    def mode(self, gesture=None):
+        if gesture in GESTURE_MODES:
+            return GESTURE_MODES[gesture]
+
+        n = self.motion.n
+        if not n:
+            return "ambient"
+
+        high_ratio = self.high / n
+        low_ratio = self.low / n
+        avg_spread = self.avg_spread
+
+        if high_ratio > 0.4 and self.motion.var > 0.02:
+            return "fm" if (self.torso.mean > 0.03 and avg_spread > 0.4) else "rhythmic"
+        if avg_spread > 0.5:
+            return "granular"
+        if self.motion.mean < 0.2 and low_ratio > 0.5:
+            return "ambient"
+
+        return "ambient"
+
+
+class GestureDetector:
+    # Sliding-window detector over the first tracked person's wrists and
+    # shoulders. Each frame is reduced to a few flags whose window sums are
+    # kept incrementally, so an update costs the same for any window length.
+
+    def __init__(self, window=None):
+        self.window = window or config.GESTURE_WINDOW
+        self.flags = deque()
+        self.still = 0
+        self.raised = 0
+        self.reversals = 0
+        self.turn = 0.0
+        self.jumps = 0
+        self.mid_y = deque(maxlen=JUMP_LAG + 1)
+        self.prev_angle = None
+        self.strokes = [[0, 0.0], [0, 0.0]]  # per wrist: direction, extreme x
+        self.counts = {}
+        self.frames = 0
+        self.gesture = None
+
+    def _stroke(self, side, x, swing, raised):
+        # Counts a reversal once a raised wrist has travelled `swing` back
+        # from its furthest point in the current direction
+        state = self.strokes[side]
+        direction, extreme = state
+        if not raised:
+            state[:] = [0, x]
+            return False
+        if direction == 0:
+            if abs(x - extreme) > swing:
+                state[:] = [1 if x > extreme else -1, x]
+            return False
+        if (x - extreme) * direction > 0:
+            state[1] = x
+            return False
+        if abs(x - extreme) > swing:
+            state[:] = [-direction, x]
+            return True
+        return False
+
+    def update(self, energy, person=None):
+        # person: (lw.x, lw.y, rw.x, rw.y, ls.x, ls.y, rs.x, rs.y) or None
+        still = energy < STILL_ENERGY
+        raised = reversal = jumped = False
+        turn = 0.0
+
+        if person is not None:
+            lwx, lwy, rwx, rwy, lsx, lsy, rsx, rsy = person
+            width = max(math.hypot(rsx - lsx, rsy - lsy), 1e-3)
+            margin = RAISE_MARGIN * width
+            left_up = lwy < lsy - margin
+            right_up = rwy < rsy - margin
+            raised = left_up and right_up
+
+            swing = WAVE_SWING * width
+            reversal = self._stroke(0, lwx, swing, lwy < lsy)
+            reversal = self._stroke(1, rwx, swing, rwy < rsy) or reversal
+
+            angle = math.atan2(rsy - lsy, rsx - lsx)
+            if self.prev_angle is not None:
+                turn = abs((angle - self.prev_angle + math.pi) % (2 * math.pi) - math.pi)
+                turn = max(turn - SPIN_JITTER, 0.0)
+            self.prev_angle = angle
+
+            self.mid_y.append((lsy + rsy) * 0.5)
+            if len(self.mid_y) == self.mid_y.maxlen:
+                jumped = self.mid_y[0] - self.mid_y[-1] > JUMP_RISE * width
+        else:
+            self.prev_angle = None
+            self.mid_y.clear()
+            for state in self.strokes:
+                state[0] = 0
+
+        self.flags.append((still, raised, reversal, turn, jumped))
+        self.still += still
+        self.raised += raised
+        self.reversals += reversal
+        self.turn += turn
+        self.jumps += jumped
+        if len(self.flags) > self.window:
+            s, r, v, t, j = self.flags.popleft()
+            self.still -= s
+            self.raised -= r
+            self.reversals -= v
+            self.turn = max(self.turn - t, 0.0)
+            self.jumps -= j
+
+        self.gesture = self._classify()
+        self.frames += 1
+        if self.gesture:
+            self.counts[self.gesture] = self.counts.get(self.gesture, 0) + 1
+        return self.gesture
+
+    def _classify(self):
+        n = len(self.flags)
+        if self.jumps:
+            return "jump"
+        if self.turn > SPIN_TURN:
+            return "spin"
+        if self.reversals >= WAVE_REVERSALS:
+            return "wave"
+        if self.raised > RAISE_SHARE * n:
+            return "raise_arms"
+        if n == self.window and self.still >= STILL_SHARE * n:
+            return "stillness"
+        return None
+
+    def dominant(self, share=None):
+        # The gesture held for the largest part of the session, if that part
+        # is at least `share` of all frames
+        share = config.GESTURE_SESSION_SHARE if share is None else share
+        if not self.counts:
+            return None
+        gesture, count = max(self.counts.items(), key=lambda kv: kv[1])
+        return gesture if count >= share * self.frames else None
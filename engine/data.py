@@ -2,16 +2,21 @@
 import numpy as np
 import math
 import config
+from engine.history import SpillHistory, PoseHistory
+from engine.classifier import ModeClassifier, GestureDetector
 
 class DataCollector:
     def __init__(self):
-        self.motion_hist = []
-        self.mod_hist = []
-        self.pose_hist = []
-        self.spectral_hist = []
+        self.motion_hist = SpillHistory()
+        self.mod_hist = SpillHistory((3,))
+        self.pose_hist = PoseHistory()
+        self.spectral_hist = SpillHistory((3, config.N_BINS))
         self.current_energy = 0.0
         self.current_spread = 0.0
         self.current_gesture = None
+        self.current_mode = "ambient"
+        self.classifier = ModeClassifier()
+        self.gestures = GestureDetector()
 
     def process(self, mag, c_ang, c_mag, cx, cy, pose_result):
         if mag is not None:
@@ -26,7 +31,7 @@ class DataCollector:
         flat_mag = c_mag.flatten()
         act = flat_mag > 0.1
 
-        S_frame = [np.zeros(config.N_BINS, dtype=np.float32) for _ in range(3)]
+        S_frame = np.zeros((3, config.N_BINS), dtype=np.float32)
         if np.any(act):
             hist, _ = np.histogram(
                 flat_ang[act],
@@ -34,13 +39,16 @@ class DataCollector:
                 range=(0, 2 * np.pi),
                 weights=flat_mag[act]
             )
-            hist = hist.astype(np.float32)
+            # Per-pixel weights, rescaled to a 640x480 frame, so the spectrum
+            # does not depend on the analysis resolution
+            hist = hist.astype(np.float32) * np.float32(config.REFERENCE_PIXELS / flat_mag.size)
             S_frame[0] = hist * (1.0 - avg_speed)
             S_frame[1] = hist
             S_frame[2] = hist * avg_speed
 
         self.spectral_hist.append(S_frame)
         frame_feats = []
+        person = None
         if pose_result and pose_result.pose_landmarks:
             for lm in pose_result.pose_landmarks:
                 try:
@@ -50,6 +58,8 @@ class DataCollector:
                     frame_feats.append((lw.x, lw.y, rw.x, rw.y, angle, center_x))
                 except (IndexError, AttributeError):
                     continue
+                if person is None:
+                    person = (lw.x, lw.y, rw.x, rw.y, ls.x, ls.y, rs.x, rs.y)
 
         self.pose_hist.append(frame_feats)
         if frame_feats:
@@ -58,4 +68,15 @@ class DataCollector:
         else:
             self.current_spread = 0.0
 
+        self.classifier.update(self.current_energy, frame_feats)
+        self.current_gesture = self.gestures.update(self.current_energy, person)
+        self.current_mode = self.classifier.mode(self.current_gesture if config.GESTURE_MODE_OVERRIDE else None)
+
         return self.current_energy, self.current_spread
+
+    def session_mode(self):
+        # Synthesis mode for the whole session from the motion and pose
+        # statistics; with GESTURE_MODE_OVERRIDE, a gesture held through
+        # enough of it picks the mode instead
+        gesture = self.gestures.dominant() if config.GESTURE_MODE_OVERRIDE else None
+        return self.classifier.mode(gesture)
@@ -0,0 +1,174 @@
+# engine/effects.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Schroeder-style network: comb delays are ratios of the requested delay,
+# allpass delays are fixed short diffusers (seconds).
+COMB_RATIOS = (1.0, 1.13, 1.27, 1.41)
+ALLPASS_DELAYS = (0.005, 0.0017)
+ALLPASS_GAIN = 0.7
+GATE_BLOCK = 1 << 16
+FFT_SMOOTH_RADIUS = 256
+
+
+def _as_f32(audio):
+    return np.asarray(audio, dtype=np.float32)
+
+
+def _output(audio, out):
+    # A fresh float32 copy of audio, or audio written into `out`, which may be
+    # audio itself when the caller owns the buffer.
+    if out is None:
+        return np.array(audio, dtype=np.float32)
+    if out is not audio:
+        out[...] = audio
+    return out
+
+
+def _normalize(out, peak=0.9):
+    max_val = np.max(np.abs(out)) if len(out) else 0.0
+    if max_val > 0:
+        out *= peak / (max_val + 1e-6)
+    return out
+
+
+def _delay_blocks(x, delay):
+    # Reshape a signal into rows of `delay` samples so a recurrence over
+    # y[n - delay] becomes a first-order recurrence down axis 0.
+    n = len(x)
+    rows = -(-n // delay)
+    padded = np.zeros(rows * delay, dtype=np.float32)
+    padded[:n] = x
+    return padded.reshape(rows, delay)
+
+
+def _comb(x, delay, gain):
+    import scipy.signal
+    # y[n] = x[n] + g * y[n - D]
+    b = np.array([1.0], dtype=np.float32)
+    a = np.array([1.0, -gain], dtype=np.float32)
+    y = scipy.signal.lfilter(b, a, _delay_blocks(x, delay), axis=0)
+    return y.ravel()[:len(x)]
+
+
+def _allpass(x, delay, gain):
+    import scipy.signal
+    # y[n] = -g * x[n] + x[n - D] + g * y[n - D]
+    b = np.array([-gain, 1.0], dtype=np.float32)
+    a = np.array([1.0, -gain], dtype=np.float32)
+    y = scipy.signal.lfilter(b, a, _delay_blocks(x, delay), axis=0)
+    return y.ravel()[:len(x)]
+
+
+def reverb(audio, sr, delay_s=0.3, decay=0.5, out=None):
+    # Returns a new array unless `out` is given; out=audio works in place.
+    audio = _as_f32(audio)
+    n = len(audio)
+    delay = int(sr * delay_s)
+    if delay <= 0 or delay >= n:
+        return _output(audio, out)
+
+    wet = np.zeros(n, dtype=np.float32)
+    for ratio in COMB_RATIOS:
+        d = min(n - 1, max(1, int(delay * ratio)))
+        wet += _comb(audio, d, decay)
+    wet -= len(COMB_RATIOS) * audio
+    wet *= 1.0 / len(COMB_RATIOS)
+
+    for ap_s in ALLPASS_DELAYS:
+        wet = _allpass(wet, max(1, int(sr * ap_s)), ALLPASS_GAIN)
+
+    out = _output(audio, out)
+    out += wet
+    max_val = np.max(np.abs(out))
+    if max_val > 1.0:
+        out *= 0.99 / max_val
+    return out
+
+
+def granular(audio, sr, grain_ms=50, overlap=0.5, rng=None):
+    audio = _as_f32(audio)
+    n = len(audio)
+    grain_len = max(10, int(sr * grain_ms * 0.001))
+    step = max(1, int(grain_len * (1.0 - overlap)))
+
+    if grain_len >= n:
+        return audio.copy()
+
+    starts = np.arange(0, n - grain_len, step)
+    n_grains = len(starts)
+    order = (rng or np.random).permutation(n_grains)
+    src = starts[order]
+
+    # Each grain is split into k sub-blocks of `step` samples; sub-block j of
+    # every grain lands contiguously at j*step + i*step, so overlap-add is k
+    # vectorized adds over strided views instead of a loop over grains.
+    k = -(-grain_len // step)
+    window = np.zeros(k * step, dtype=np.float32)
+    window[:grain_len] = np.hanning(grain_len)
+    padded = np.zeros(n + k * step, dtype=np.float32)
+    padded[:n] = audio
+    view = sliding_window_view(padded, step)
+
+    out = np.zeros((n_grains + k) * step, dtype=np.float32)
+    for j in range(k):
+        seg = view[src + j * step]
+        seg *= window[j * step:(j + 1) * step]
+        out[j * step:j * step + n_grains * step] += seg.ravel()
+
+    return _normalize(out[:n])
+
+
+def _gaussian_smooth(x, sigma, truncate=4.0):
+    import scipy.ndimage
+    import scipy.signal
+    radius = int(truncate * sigma + 0.5)
+    # Curves passed at audio rate get sigmas in the thousands, where direct
+    # convolution is quadratic; switch to FFT overlap-add with the same
+    # 'reflect' edge handling as gaussian_filter1d.
+    if radius <= FFT_SMOOTH_RADIUS or radius >= len(x):
+        return scipy.ndimage.gaussian_filter1d(x, sigma=sigma, truncate=truncate)
+    k = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (k / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(x, radius, mode='symmetric')
+    return scipy.signal.oaconvolve(padded, kernel, mode='valid')
+
+
+def rhythmic_gate(audio, motion_curve, sr, floor=0.15, width_s=0.06, out=None):
+    # Returns a new array unless `out` is given; out=audio works in place.
+    audio = _as_f32(audio)
+    # Smoothed in float64: at float32 a broad maximum is flat to the last bit
+    # and the strict peak test below misses it.
+    m_smooth = _gaussian_smooth(
+        np.asarray(motion_curve, dtype=np.float64),
+        sigma=max(1, len(motion_curve) // 200)
+    )
+    threshold = np.mean(m_smooth) + 0.5 * np.std(m_smooth)
+    peaks = np.where(
+        (m_smooth[1:-1] > m_smooth[:-2]) &
+        (m_smooth[1:-1] > m_smooth[2:]) &
+        (m_smooth[1:-1] > threshold)
+    )[0] + 1
+
+    out = _output(audio, out)
+    audio_len = len(out)
+    width = max(1, int(width_s * sr))
+    if not len(peaks):
+        out *= floor
+        return out
+
+    # Overlapping triangles combine by max, which is a triangle around the
+    # nearest peak centre, so the envelope is a function of that distance.
+    centers = (peaks * audio_len) // len(motion_curve)
+    inv_width = np.float32(1.0 / width)
+    for start in range(0, audio_len, GATE_BLOCK):
+        pos = np.arange(start, min(audio_len, start + GATE_BLOCK))
+        right = np.searchsorted(centers, pos)
+        left = np.maximum(right - 1, 0)
+        right = np.minimum(right, len(centers) - 1)
+        dist = np.minimum(np.abs(pos - centers[left]), np.abs(centers[right] - pos))
+        env = 1.0 - dist.astype(np.float32) * inv_width
+        np.clip(env, floor, 1.0, out=env)
+        out[start:start + len(env)] *= env
+    return out
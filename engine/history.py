@@ -0,0 +1,114 @@
+# engine/history.py
+import operator
+import tempfile
+import numpy as np
+import config
+
+
+class SpillHistory:
+    # Append-only per-frame history of fixed-shape rows. The newest `window`
+    # rows live in RAM; older ones are written to an anonymous temp file and
+    # read back through a read-only memmap, so RSS stays flat for any session
+    # length while indexing and slicing behave like one array.
+
+    def __init__(self, row_shape=(), dtype=np.float32, window=None):
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.window = window or config.HISTORY_WINDOW
+        self._hot = np.empty((self.window,) + self.row_shape, dtype=self.dtype)
+        self._n_hot = 0
+        self._n_cold = 0
+        self._file = None
+        self._cold_map = None
+
+    def _encode(self, item):
+        return item
+
+    def _decode(self, row):
+        return row
+
+    def append(self, item):
+        if self._n_hot == self.window:
+            self._spill()
+        self._hot[self._n_hot] = self._encode(item)
+        self._n_hot += 1
+
+    def _spill(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=config.HISTORY_DIR)
+        # Plain writes rather than a writable mapping, so spilled pages are
+        # never resident in this process.
+        self._file.seek(0, 2)
+        self._file.write(self._hot[:self._n_hot].tobytes())
+        self._file.flush()
+        self._n_cold += self._n_hot
+        self._n_hot = 0
+        self._cold_map = None
+
+    def _cold(self):
+        if self._cold_map is None:
+            self._cold_map = np.memmap(self._file, dtype=self.dtype, mode='r',
+                                       shape=(self._n_cold,) + self.row_shape)
+        return self._cold_map
+
+    def __len__(self):
+        return self._n_cold + self._n_hot
+
+    def _rows(self, start, stop):
+        # Raw rows [start, stop) as an array; cold rows are memmap-backed, hot
+        # rows are copied since the hot buffer is reused after a spill.
+        n_cold = self._n_cold
+        parts = []
+        if start < n_cold:
+            parts.append(self._cold()[start:min(stop, n_cold)])
+        if stop > n_cold:
+            parts.append(self._hot[max(start - n_cold, 0):stop - n_cold].copy())
+        if not parts:
+            return np.empty((0,) + self.row_shape, dtype=self.dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self._rows(0, len(self))[key]
+            return self._rows(start, max(start, stop))
+        idx = operator.index(key)
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("history index out of range")
+        if idx < self._n_cold:
+            return self._decode(self._cold()[idx])
+        return self._decode(self._hot[idx - self._n_cold])
+
+    def __iter__(self):
+        for start in range(0, len(self), self.window):
+            for row in self._rows(start, min(len(self), start + self.window)):
+                yield self._decode(row)
+
+    def __array__(self, dtype=None, copy=None):
+        rows = self._rows(0, len(self))
+        return np.asarray(rows, dtype=dtype) if dtype is not None else np.asarray(rows)
+
+
+class PoseHistory(SpillHistory):
+    # Per-frame pose features are lists of up to MAX_PEOPLE 6-tuples. They are
+    # stored as NaN-padded (MAX_PEOPLE, 6) rows and returned as lists again.
+
+    def __init__(self, window=None):
+        super().__init__((config.MAX_PEOPLE, 6), np.float32, window)
+
+    def _encode(self, item):
+        row = np.full(self.row_shape, np.nan, dtype=self.dtype)
+        if item:
+            feats = np.asarray(item[:config.MAX_PEOPLE], dtype=self.dtype)
+            row[:len(feats)] = feats
+        return row
+
+    def _decode(self, row):
+        return [tuple(float(v) for v in f) for f in row if not np.isnan(f[0])]
+
+    def __getitem__(self, key):
+        rows = super().__getitem__(key)
+        return [self._decode(r) for r in rows] if isinstance(key, slice) else rows
@@ -0,0 +1,175 @@
+# engine/live.py
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+import config
+from engine.visuals import VisualEngine
+from engine.pose import PoseEngine
+from engine.data import DataCollector
+
+
+class LiveSession:
+    # One streaming performance: JPEG frames are submitted with client
+    # timestamps, analysed on a background thread by long-lived engines, and
+    # the latest overlay is published for streaming back. The inbound queue
+    # is bounded; when it is full the oldest pending frame is dropped.
+
+    def __init__(self, session_id, video_path, fps=None, mirror=True):
+        self.session_id = session_id
+        self.video_path = video_path
+        self.fps = fps or config.LIVE_FPS
+        self.mirror = mirror
+
+        # Created on the first frame, once the client's frame size is known
+        self.visuals = None
+        self.writer = None
+        self.pose_tracker = PoseEngine()
+        self.collector = DataCollector()
+
+        self.queue = queue.Queue(maxsize=config.LIVE_QUEUE_SIZE)
+        self.frames_in = 0
+        self.frames_dropped = 0
+        self.frames_processed = 0
+        self.frames_written = 0
+        self.t0 = None
+        self.last_ts = -1
+        self.last_seen = time.monotonic()
+
+        self.latest = None
+        self.seq = 0
+        self.stopping = False
+        self.closed = False
+        self.error = None
+        self.lock = threading.Lock()
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, jpeg_bytes, timestamp_ms):
+        item = (jpeg_bytes, float(timestamp_ms))
+        with self.lock:
+            if self.stopping:
+                raise RuntimeError("Session is closed")
+            self.last_seen = time.monotonic()
+            self.frames_in += 1
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.frames_dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            data, ts = item
+            frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            # MediaPipe VIDEO mode needs strictly increasing timestamps
+            if frame is None or ts <= self.last_ts:
+                self._drop()
+                continue
+            try:
+                self._process(frame, ts)
+            except Exception as e:
+                # Keep draining so submit/close never block on a dead worker
+                self.error = str(e)
+                self._drop()
+
+    def _drop(self):
+        # Also counted by submit() on the request thread
+        with self.lock:
+            self.frames_dropped += 1
+
+    def _open(self, frame):
+        h, w = frame.shape[:2]
+        self.visuals = VisualEngine(frame_size=(w, h))
+        self.writer = cv2.VideoWriter(
+            self.video_path,
+            cv2.VideoWriter_fourcc(*'MJPG'),
+            self.fps,
+            (self.visuals.w, self.visuals.h)
+        )
+
+    def _process(self, frame, ts):
+        if self.visuals is None:
+            self._open(frame)
+        visual_frame, flow_mag, c_ang, c_mag, cx, cy = self.visuals.process(frame, mirror_mode=self.mirror)
+
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        pose_result = self.pose_tracker.process(rgb, ts)
+
+        self.collector.process(flow_mag, c_ang, c_mag, cx, cy, pose_result)
+
+        final_output = self.pose_tracker.draw_overlay(visual_frame, pose_result) if config.SHOW_SKELETON else visual_frame
+
+        # Keep the recording on the client's clock: hold this frame for as
+        # many output frames as have elapsed since the last one.
+        if self.t0 is None:
+            self.t0 = ts
+        target = int((ts - self.t0) * self.fps * 0.001) + 1
+        while self.frames_written < target:
+            self.writer.write(final_output)
+            self.frames_written += 1
+
+        self.last_ts = ts
+        self.frames_processed += 1
+
+        ok, buf = cv2.imencode('.jpg', final_output, [cv2.IMWRITE_JPEG_QUALITY, config.LIVE_JPEG_QUALITY])
+        if ok:
+            with self.cond:
+                self.latest = buf.tobytes()
+                self.seq += 1
+                self.cond.notify_all()
+
+    def frames(self, timeout=1.0):
+        # Yields each new overlay JPEG until the session closes. Slow readers
+        # simply skip to the newest frame.
+        seen = 0
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.seq != seen or self.closed, timeout=timeout)
+                if self.closed:
+                    return
+                if self.seq == seen:
+                    continue
+                seen = self.seq
+                data = self.latest
+            yield data
+
+    @property
+    def duration(self):
+        return self.frames_written / self.fps
+
+    def stats(self):
+        return {
+            'frames_in': self.frames_in,
+            'frames_processed': self.frames_processed,
+            'frames_dropped': self.frames_dropped,
+            'queued': self.queue.qsize(),
+            'duration': self.duration,
+            'mode': self.collector.current_mode,
+            'gesture': self.collector.current_gesture,
+            'error': self.error
+        }
+
+    def close(self):
+        with self.lock:
+            if self.stopping:
+                return
+            self.stopping = True
+        # Let already-queued frames finish, then stop the worker
+        self.queue.put(None)
+        self.thread.join()
+        if self.writer is not None:
+            self.writer.release()
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
@@ -0,0 +1,17 @@
+# engine/media.py
+import cv2
+import config
+
+
+def probe_video(path):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError("Could not open video file")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    fps = fps if 0 < fps <= 120 else 30.0
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or config.WIDTH
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or config.HEIGHT
+    cap.release()
+    duration = frames / fps if frames > 0 else 0.0
+    return {'fps': fps, 'frames': frames, 'width': width, 'height': height, 'duration': duration}
@@ -0,0 +1,172 @@
+# engine/pipeline.py
+import multiprocessing
+import queue
+import types
+from collections import namedtuple
+import cv2
+import numpy as np
+import config
+from engine.ring import FrameRing
+from engine.visuals import fit_size, analysis_size
+
+# Decode, VisualEngine and PoseEngine each run in their own process and
+# DataCollector stays in the caller. Frames and per-frame fields live in a
+# shared FrameRing; the queues between stages carry only slot indices.
+#
+#   decode -> frame slot -> visuals -> render/mag/c_ang/c_mag -+-> collector
+#                        -> pose    -> landmarks --------------+   + writer
+
+N_LANDMARKS = 33
+Landmark = namedtuple('Landmark', 'x y')
+
+
+def pose_to_array(result, out):
+    out[:] = np.nan
+    for i, landmarks in enumerate(result.pose_landmarks[:config.MAX_PEOPLE]):
+        out[i, :len(landmarks)] = [(lm.x, lm.y) for lm in landmarks[:N_LANDMARKS]]
+
+
+def pose_from_array(arr):
+    # Stand-in for a PoseLandmarkerResult: DataCollector and draw_overlay only
+    # read pose_landmarks[i][j].x / .y
+    people = [[Landmark(float(x), float(y)) for x, y in person]
+              for person in arr if not np.isnan(person[0, 0])]
+    return types.SimpleNamespace(pose_landmarks=people)
+
+
+def _decode(ring, video_path, fps, step, free_q, out_qs):
+    cap = cv2.VideoCapture(video_path)
+    seq = 0
+    src_idx = 0
+    while True:
+        if src_idx % step:
+            if not cap.grab():
+                break
+            src_idx += 1
+            continue
+
+        slot = free_q.get()
+        buf = ring['frame'][slot]
+        ret, frame = cap.read(buf)
+        if not ret:
+            break
+        # Decoded in place unless the stream's frame size differs from the probe
+        if not np.shares_memory(frame, buf):
+            buf[:] = cv2.resize(frame, (buf.shape[1], buf.shape[0]))
+
+        ring['ts'][slot] = src_idx * 1000.0 / fps
+        ring.seq[slot] = seq
+        for q in out_qs:
+            q.put(slot)
+        seq += 1
+        src_idx += 1
+
+    cap.release()
+    for q in out_qs:
+        q.put(None)
+
+
+def _visuals(ring, step, frame_size, mirror, in_q, out_q):
+    from engine.visuals import VisualEngine
+    visuals = VisualEngine(frame_step=step, frame_size=frame_size)
+    while True:
+        slot = in_q.get()
+        if slot is None:
+            break
+        visual_frame, flow_mag, c_ang, c_mag, cx, cy = visuals.process(ring['frame'][slot], mirror_mode=mirror)
+        ring['render'][slot] = visual_frame
+        ring['mag'][slot] = flow_mag
+        ring['c_ang'][slot] = c_ang
+        ring['c_mag'][slot] = c_mag
+        ring['centroid'][slot] = (cx, cy)
+        out_q.put(slot)
+    out_q.put(None)
+
+
+def _pose(ring, in_q, out_q):
+    from engine.pose import PoseEngine
+    pose_tracker = PoseEngine()
+    while True:
+        slot = in_q.get()
+        if slot is None:
+            break
+        rgb = cv2.cvtColor(ring['frame'][slot], cv2.COLOR_BGR2RGB)
+        pose_result = pose_tracker.process(rgb, ring['ts'][slot])
+        pose_to_array(pose_result, ring['pose'][slot])
+        out_q.put(slot)
+    out_q.put(None)
+
+
+def _get(q, procs):
+    # Blocking get that notices a crashed stage instead of waiting forever
+    while True:
+        try:
+            return q.get(timeout=1.0)
+        except queue.Empty:
+            for p in procs:
+                if p.exitcode not in (None, 0):
+                    raise RuntimeError(f"Pipeline stage {p.name} failed (exit code {p.exitcode})")
+
+
+def analyse_video(video_path, fps, step, frame_size, collector, writer, show_skeleton=False, mirror=False):
+    # Same results as the sequential loop in app.process_video, with the
+    # stages overlapped across processes. Returns the number of frames written.
+    from engine.pose import PoseEngine
+
+    src_w, src_h = frame_size
+    w, h = fit_size(src_w, src_h, config.WIDTH, config.HEIGHT)
+    aw, ah = analysis_size(w, h)
+    ring = FrameRing({
+        'frame': ((src_h, src_w, 3), np.uint8),
+        'ts': ((), np.float64),
+        'render': ((h, w, 3), np.uint8),
+        'mag': ((ah, aw), np.float32),
+        'c_ang': ((ah, aw), np.float32),
+        'c_mag': ((ah, aw), np.float32),
+        'centroid': ((2,), np.float64),
+        'pose': ((config.MAX_PEOPLE, N_LANDMARKS, 2), np.float32),
+    }, config.PIPELINE_SLOTS)
+
+    ctx = multiprocessing.get_context(config.PIPELINE_START_METHOD)
+    free_q, vis_in, pose_in, vis_out, pose_out = (ctx.Queue() for _ in range(5))
+    for slot in range(ring.n_slots):
+        free_q.put(slot)
+
+    procs = [
+        ctx.Process(target=_decode, name='decode', daemon=True,
+                    args=(ring, video_path, fps, step, free_q, (vis_in, pose_in))),
+        ctx.Process(target=_visuals, name='visuals', daemon=True,
+                    args=(ring, step, frame_size, mirror, vis_in, vis_out)),
+        ctx.Process(target=_pose, name='pose', daemon=True,
+                    args=(ring, pose_in, pose_out)),
+    ]
+    for p in procs:
+        p.start()
+
+    try:
+        n = 0
+        while True:
+            slot = _get(vis_out, procs)
+            pose_slot = _get(pose_out, procs)
+            if slot is None or pose_slot is None:
+                break
+            if slot != pose_slot or ring.seq[slot] != n:
+                raise RuntimeError("Pipeline stages out of order")
+
+            cx, cy = ring['centroid'][slot]
+            pose_result = pose_from_array(ring['pose'][slot])
+            collector.process(ring['mag'][slot], ring['c_ang'][slot], ring['c_mag'][slot], cx, cy, pose_result)
+
+            visual_frame = ring['render'][slot]
+            writer.write(PoseEngine.draw_overlay(visual_frame, pose_result) if show_skeleton else visual_frame)
+            free_q.put(slot)
+            n += 1
+
+        for p in procs:
+            p.join()
+        return n
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        ring.close()
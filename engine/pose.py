@@ -6,6 +6,16 @@ import numpy as np
 import cv2
 import config
 import os
+import functools
+
+@functools.lru_cache(maxsize=None)
+def load_model_buffer(path=config.POSE_MODEL_PATH):
+    # Read once per process. Under gunicorn --preload the master reads it and
+    # workers share the pages copy-on-write.
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing model: {path}")
+    with open(path, 'rb') as f:
+        return f.read()
 
 class PoseEngine:
     CONNECTIONS = [
@@ -18,10 +28,7 @@ class PoseEngine:
     RELEVANT_INDICES = [0, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28]
     
     def __init__(self):
-        if not os.path.exists(config.POSE_MODEL_PATH):
-            raise FileNotFoundError(f"Missing model: {config.POSE_MODEL_PATH}")
-
-        base_opts = mp_python.BaseOptions(model_asset_path=config.POSE_MODEL_PATH)
+        base_opts = mp_python.BaseOptions(model_asset_buffer=load_model_buffer())
         pose_opts = mp_vision.PoseLandmarkerOptions(
             base_options=base_opts,
             running_mode=mp_vision.RunningMode.VIDEO,
@@ -37,7 +44,8 @@ class PoseEngine:
         result = self.landmarker.detect_for_video(mp_image, int(timestamp_ms))
         return result
 
-    def draw_overlay(self, frame, pose_result):
+    @classmethod
+    def draw_overlay(cls, frame, pose_result):
         if not pose_result.pose_landmarks:
             return frame
 
@@ -48,7 +56,7 @@ class PoseEngine:
             return int(landmarks[idx].x * w), int(landmarks[idx].y * h)
 
         for landmarks in pose_result.pose_landmarks:
-            for start, end in self.CONNECTIONS:
+            for start, end in cls.CONNECTIONS:
                 try:
                     pt1 = get_xy(landmarks, start)
                     pt2 = get_xy(landmarks, end)
@@ -56,7 +64,7 @@ class PoseEngine:
                 except (IndexError, AttributeError):
                     pass
 
-            for idx in self.RELEVANT_INDICES:
+            for idx in cls.RELEVANT_INDICES:
                 try:
                     pt = get_xy(landmarks, idx)
                     cv2.circle(annotated_frame, pt, 5, (0, 0, 255), -1)
@@ -0,0 +1,52 @@
+# engine/ring.py
+import numpy as np
+from multiprocessing import shared_memory
+
+ALIGN = 64
+
+
+class FrameRing:
+    # Fixed-size slots of named arrays in one shared-memory block. Each field
+    # is stored as an (n_slots, *shape) array, and seq[i] holds the sequence
+    # number of the item currently in slot i. Processes attach by pickling
+    # the ring (only its layout and block name travel) and then hand each
+    # other slot indices; frames and fields are never serialized.
+
+    def __init__(self, fields, n_slots, name=None):
+        self.fields = {k: (tuple(shape), np.dtype(dtype).str) for k, (shape, dtype) in fields.items()}
+        self.n_slots = n_slots
+
+        offsets = {}
+        size = n_slots * 8
+        for k, (shape, dtype) in self.fields.items():
+            size = -(-size // ALIGN) * ALIGN
+            offsets[k] = size
+            size += n_slots * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.seq = np.ndarray((n_slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.arrays = {
+            k: np.ndarray((n_slots,) + shape, dtype=dtype, buffer=self.shm.buf, offset=offsets[k])
+            for k, (shape, dtype) in self.fields.items()
+        }
+        if self.owner:
+            self.seq[:] = -1
+
+    def __reduce__(self):
+        return (FrameRing, (self.fields, self.n_slots, self.shm.name))
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    @property
+    def nbytes(self):
+        return self.shm.size
+
+    def close(self):
+        # Views must go before the mapping can be released
+        self.seq = None
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,192 @@
+# engine/samples.py
+import os
+import hashlib
+import subprocess
+import threading
+import cv2
+import config
+from engine.media import probe_video
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+WARM_LOCK = 'warm.lock'
+
+
+class SampleCatalog:
+    # Index of the Samples library. Each video is probed once and again only
+    # when its name, size or mtime changes; per-file metadata, poster
+    # thumbnails and low-bitrate preview proxies are keyed by (name, size,
+    # mtime) and cached on disk, so the gallery never touches the sources.
+
+    def __init__(self, samples_dir=None, cache_dir=None):
+        # Absolute, since Flask's send_file resolves relative paths against
+        # the app root rather than the working directory
+        self.samples_dir = os.path.abspath(samples_dir or config.SAMPLES_DIR)
+        self.cache_dir = os.path.abspath(cache_dir or config.SAMPLE_CACHE_DIR)
+        self.lock = threading.Lock()
+        self.signature = None
+        self.entries = {}
+        self.version = ''
+        self.building = {}
+
+    def _key(self, filename, st):
+        raw = f"{filename}:{st.st_size}:{st.st_mtime_ns}".encode()
+        return hashlib.sha1(raw).hexdigest()[:16]
+
+    def _scan(self):
+        entries = {}
+        for item in sorted(os.scandir(self.samples_dir), key=lambda e: e.name):
+            if not item.is_file() or not item.name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            st = item.stat()
+            key = self._key(item.name, st)
+            old = self.entries.get(item.name)
+            if old and old['key'] == key:
+                entries[item.name] = old
+                continue
+            try:
+                probe = probe_video(item.path)
+            except ValueError:
+                continue
+            entries[item.name] = {
+                'filename': item.name,
+                'name': os.path.splitext(item.name)[0],
+                'key': key,
+                'path': item.path,
+                'size': st.st_size,
+                'duration': round(probe['duration'], 2),
+                'width': probe['width'],
+                'height': probe['height'],
+                'fps': probe['fps']
+            }
+        return entries
+
+    def _signature(self):
+        # (name, size, mtime) of every video. Overwriting a file in place
+        # leaves the directory's mtime alone, so each file is compared.
+        try:
+            items = os.scandir(self.samples_dir)
+        except FileNotFoundError:
+            return None
+        with items:
+            return frozenset(
+                (item.name, st.st_size, st.st_mtime_ns)
+                for item in items
+                if item.name.lower().endswith(VIDEO_EXTENSIONS) and item.is_file()
+                for st in (item.stat(),)
+            )
+
+    def refresh(self):
+        # Cheap when nothing changed: a stat of each video, no probing
+        signature = self._signature()
+        with self.lock:
+            if signature == self.signature:
+                return False
+            self.entries = self._scan() if signature is not None else {}
+            self.signature = signature
+            self.version = hashlib.sha1(''.join(e['key'] for e in self.entries.values()).encode()).hexdigest()[:16]
+        if config.SAMPLE_PRECOMPUTE and self.entries:
+            threading.Thread(target=self.warm, daemon=True).start()
+        return True
+
+    def list(self):
+        self.refresh()
+        return list(self.entries.values())
+
+    def get(self, filename):
+        self.refresh()
+        return self.entries.get(filename)
+
+    def warm(self):
+        # Every worker refreshes its own catalog, so warming is serialised
+        # across processes: the next warmer waits and finds the assets built.
+        # Without fcntl that only costs duplicate work, since assets are
+        # published with an atomic rename.
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if fcntl is None:
+            return self._warm()
+        with open(os.path.join(self.cache_dir, WARM_LOCK), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._warm()
+
+    def _warm(self):
+        entries = list(self.entries.values())
+        # Drop assets of samples that were removed or replaced
+        keys = {e['key'] for e in entries}
+        for name in os.listdir(self.cache_dir):
+            if name != WARM_LOCK and name.split('.')[0] not in keys:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+        for entry in entries:
+            try:
+                self.thumbnail(entry)
+                self.preview(entry)
+            except Exception as e:
+                print(f"Warning: Could not build preview for {entry['filename']}: {e}")
+
+    def _asset(self, entry, suffix, build):
+        # Built once per (file, version) and published with an atomic rename,
+        # so concurrent requests and workers never see a partial file
+        path = os.path.join(self.cache_dir, f"{entry['key']}{suffix}")
+        if os.path.exists(path):
+            return path
+        with self.lock:
+            lock = self.building.setdefault(path, threading.Lock())
+        with lock:
+            if not os.path.exists(path):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp{suffix}"
+                try:
+                    build(entry['path'], tmp)
+                    os.replace(tmp, path)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+        return path
+
+    def thumbnail(self, entry):
+        return self._asset(entry, '.jpg', self._build_thumbnail)
+
+    def preview(self, entry):
+        return self._asset(entry, '.mp4', self._build_preview)
+
+    def _build_thumbnail(self, src, dst):
+        cap = cv2.VideoCapture(src)
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # A little way in: first frames are often black or a fade
+        if frames > 1:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, min(frames - 1, frames // 10))
+        ret, frame = cap.read()
+        cap.release()
+        if not ret:
+            raise ValueError("Could not read a frame for the thumbnail")
+        h, w = frame.shape[:2]
+        tw = min(w, config.SAMPLE_THUMB_WIDTH)
+        frame = cv2.resize(frame, (tw, max(2, round(h * tw / w))), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, config.SAMPLE_THUMB_QUALITY])
+        if not ok:
+            raise ValueError("Could not encode thumbnail")
+        with open(dst, 'wb') as f:
+            f.write(buf.tobytes())
+
+    def _build_preview(self, src, dst):
+        from engine.audio import get_ffmpeg_exe
+        ffmpeg = get_ffmpeg_exe()
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg is not available")
+        # Silent, low-resolution H.264 with the moov atom up front so the
+        # browser can start playing before the download finishes
+        cmd = [
+            ffmpeg, '-y', '-loglevel', 'error', '-i', src,
+            '-t', str(config.SAMPLE_PREVIEW_SECONDS),
+            '-an', '-vf', f"scale=-2:'min({config.SAMPLE_PREVIEW_HEIGHT},trunc(ih/2)*2)'",
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', str(config.SAMPLE_PREVIEW_CRF),
+            '-pix_fmt', 'yuv420p', '-movflags', '+faststart', '-f', 'mp4', dst
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
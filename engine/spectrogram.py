@@ -0,0 +1,111 @@
+# engine/spectrogram.py
+import cv2
+import numpy as np
+
+# Layout roughly matches the old 12x6in @ 100dpi matplotlib figure
+PLOT_W, PLOT_H = 960, 480
+MARGIN_L, MARGIN_R, MARGIN_T, MARGIN_B = 80, 130, 50, 60
+CBAR_W, CBAR_GAP = 20, 25
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+INK = (30, 30, 30)
+
+# 256-entry BGR viridis table, taken once from OpenCV's built-in colormap
+VIRIDIS_LUT = cv2.applyColorMap(
+    np.arange(256, dtype=np.uint8).reshape(-1, 1), cv2.COLORMAP_VIRIDIS
+).reshape(256, 3)
+
+
+def _nice_ticks(lo, hi, count=6):
+    span = hi - lo
+    if span <= 0:
+        return [lo]
+    raw = span / count
+    mag = 10 ** np.floor(np.log10(raw))
+    step = next(m * mag for m in (1, 2, 5, 10) if m * mag >= raw)
+    first = np.ceil(lo / step) * step
+    return list(np.arange(first, hi + step * 1e-9, step))
+
+
+def _fmt(v):
+    return f"{v:g}" if abs(v) < 1e5 else f"{v:.0e}"
+
+
+def _text(img, text, org, scale=0.45, thickness=1, align="left"):
+    (tw, th), _ = cv2.getTextSize(text, FONT, scale, thickness)
+    x, y = org
+    if align == "center":
+        x -= tw // 2
+    elif align == "right":
+        x -= tw
+    cv2.putText(img, text, (int(x), int(y + th // 2)), FONT, scale, INK, thickness, cv2.LINE_AA)
+
+
+def _vertical_text(img, text, center, scale=0.5):
+    (tw, th), base = cv2.getTextSize(text, FONT, scale, 1)
+    patch = np.full((th + base + 4, tw + 4, 3), 255, dtype=np.uint8)
+    cv2.putText(patch, text, (2, th + 2), FONT, scale, INK, 1, cv2.LINE_AA)
+    patch = cv2.rotate(patch, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    ph, pw = patch.shape[:2]
+    y0 = max(0, center[1] - ph // 2)
+    x0 = max(0, center[0] - pw // 2)
+    img[y0:y0 + ph, x0:x0 + pw] = np.minimum(img[y0:y0 + ph, x0:x0 + pw], patch)
+
+
+def _colorize(S, w, h, vmin, vmax):
+    S = np.asarray(S, dtype=np.float32)
+    shrinking = S.shape[1] >= w and S.shape[0] >= h
+    resized = cv2.resize(S, (w, h), interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+    scale = 255.0 / (vmax - vmin) if vmax > vmin else 0.0
+    idx = cv2.convertScaleAbs(resized, alpha=scale, beta=-vmin * scale)
+    # origin='lower': frequency bin 0 at the bottom
+    return VIRIDIS_LUT[idx[::-1]]
+
+
+def render_spectrogram(S, title="Motion-to-Sound Spectrogram"):
+    n_bins, n_frames = S.shape
+    vmin, vmax = float(np.min(S)), float(np.max(S))
+
+    W = MARGIN_L + PLOT_W + MARGIN_R
+    H = MARGIN_T + PLOT_H + MARGIN_B
+    img = np.full((H, W, 3), 255, dtype=np.uint8)
+    x0, y0 = MARGIN_L, MARGIN_T
+    x1, y1 = x0 + PLOT_W, y0 + PLOT_H
+
+    img[y0:y1, x0:x1] = _colorize(S, PLOT_W, PLOT_H, vmin, vmax)
+    cv2.rectangle(img, (x0 - 1, y0 - 1), (x1, y1), INK, 1)
+
+    for v in _nice_ticks(0, n_frames):
+        x = x0 + int(round(v / max(n_frames, 1) * PLOT_W))
+        cv2.line(img, (x, y1), (x, y1 + 5), INK, 1)
+        _text(img, _fmt(v), (x, y1 + 16), align="center")
+    for v in _nice_ticks(0, n_bins):
+        y = y1 - int(round(v / max(n_bins, 1) * PLOT_H))
+        cv2.line(img, (x0 - 5, y), (x0, y), INK, 1)
+        _text(img, _fmt(v), (x0 - 8, y), align="right")
+
+    _text(img, "Time (frames)", ((x0 + x1) // 2, y1 + 42), scale=0.55, align="center")
+    _vertical_text(img, "Frequency (bins)", (18, (y0 + y1) // 2), scale=0.55)
+    _text(img, title, ((x0 + x1) // 2, y0 // 2), scale=0.65, align="center")
+
+    # Colorbar
+    cx0 = x1 + CBAR_GAP
+    cx1 = cx0 + CBAR_W
+    ramp = VIRIDIS_LUT[np.linspace(255, 0, PLOT_H).astype(np.uint8)]
+    img[y0:y1, cx0:cx1] = ramp[:, None, :]
+    cv2.rectangle(img, (cx0 - 1, y0 - 1), (cx1, y1), INK, 1)
+    for v in _nice_ticks(vmin, vmax):
+        y = y1 - int(round((v - vmin) / (vmax - vmin) * PLOT_H)) if vmax > vmin else y1
+        cv2.line(img, (cx1, y), (cx1 + 4, y), INK, 1)
+        _text(img, _fmt(round(v, 6)), (cx1 + 7, y))
+    _vertical_text(img, "Magnitude (dB)", (cx1 + 70, (y0 + y1) // 2), scale=0.5)
+
+    return img
+
+
+def save_spectrogram_png(S, output_path):
+    ok, buf = cv2.imencode('.png', render_spectrogram(S))
+    if not ok:
+        raise RuntimeError("Could not encode spectrogram image")
+    with open(output_path, 'wb') as f:
+        f.write(buf.tobytes())
+    return output_path
@@ -4,10 +4,85 @@ import numpy as np
 import mediapipe as mp
 import config
 
+def analysis_step(fps):
+    # Analyse every n-th source frame so the analysed rate is near ANALYSIS_FPS
+    if not config.ANALYSIS_FPS or fps <= config.ANALYSIS_FPS:
+        return 1
+    return max(1, int(round(fps / config.ANALYSIS_FPS)))
+
+def fit_size(src_w, src_h, box_w, box_h):
+    # Largest even-sized frame with the source aspect that fits the box,
+    # never upscaled past the source
+    scale = min(box_w / src_w, box_h / src_h, 1.0)
+    return max(2, int(src_w * scale) // 2 * 2), max(2, int(src_h * scale) // 2 * 2)
+
+def analysis_size(src_w, src_h):
+    # Source aspect with the pixel count of ANALYSIS_WIDTH x ANALYSIS_HEIGHT
+    scale = min(np.sqrt(config.ANALYSIS_WIDTH * config.ANALYSIS_HEIGHT / (src_w * src_h)), 1.0)
+    return max(2, int(round(src_w * scale))), max(2, int(round(src_h * scale)))
+
+def _trail_lut():
+    # BGR for every (hue, value) a trail pixel can take at full saturation,
+    # flattened so hue * 256 + value indexes it; hue is in OpenCV's 0..180
+    hsv = np.zeros((181, 256, 3), dtype=np.uint8)
+    hsv[..., 0] = np.arange(181)[:, None]
+    hsv[..., 1] = 255
+    hsv[..., 2] = np.arange(256)[None, :]
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR).reshape(-1, 3)
+
+TRAIL_LUT = _trail_lut()
+
+class TrailRenderer:
+    # Colours the trail canvas through TRAIL_LUT, only at pixels whose value
+    # is non-zero, and composites it over the dimmed frame in preallocated
+    # buffers. Above DENSE_FRACTION of active pixels a gather costs more than
+    # converting the whole plane, which gives the same colours. The returned
+    # frame is reused on the next call.
+    DENSE_FRACTION = 0.15
+
+    def __init__(self, analysis_size, render_size):
+        aw, ah = analysis_size
+        self.render_size = render_size
+        self.hsv_scale = 90.0 / np.pi
+        self.trail = np.zeros((ah, aw, 3), dtype=np.uint8)
+        self.flat = self.trail.reshape(-1, 3)
+        self.hsv = np.zeros((ah, aw, 3), dtype=np.uint8)
+        self.saturation = np.full((ah, aw), 255, dtype=np.uint8)
+        self.upsampled = np.zeros((render_size[1], render_size[0], 3), dtype=np.uint8)
+        self.out = np.zeros_like(self.upsampled)
+
+    def render(self, frame, c_ang, c_mag):
+        # beta/gamma of -0.5 turn OpenCV's rounding into the truncation of
+        # the uint8 casts this replaces, so output matches the HSV path
+        v = cv2.convertScaleAbs(c_mag, alpha=10.0, beta=-0.5)
+        n_active = cv2.countNonZero(v)
+        if n_active > self.DENSE_FRACTION * v.size:
+            h = cv2.convertScaleAbs(c_ang, alpha=self.hsv_scale, beta=-0.5)
+            cv2.merge((h, self.saturation, v), dst=self.hsv)
+            cv2.cvtColor(self.hsv, cv2.COLOR_HSV2BGR, dst=self.trail)
+        else:
+            self.trail.fill(0)
+            if n_active:
+                active = np.flatnonzero(v)
+                h = cv2.convertScaleAbs(c_ang, alpha=self.hsv_scale, beta=-0.5)
+                idx = h.ravel()[active].astype(np.int32)
+                idx <<= 8
+                idx += v.ravel()[active]
+                self.flat[active] = TRAIL_LUT[idx]
+
+        # Trails are only upsampled to the render size for compositing
+        trail = self.trail
+        if trail.shape != self.upsampled.shape:
+            trail = cv2.resize(trail, self.render_size, dst=self.upsampled, interpolation=cv2.INTER_LINEAR)
+        return cv2.addWeighted(frame, 0.6, trail, 1.0, -0.5, dst=self.out)
+
 class VisualEngine:
-    def __init__(self):
-        self.w = config.WIDTH
-        self.h = config.HEIGHT
+    def __init__(self, frame_step=1, frame_size=None):
+        src_w, src_h = frame_size or (config.WIDTH, config.HEIGHT)
+        # Render frame: aspect-preserving, within WIDTH x HEIGHT
+        self.w, self.h = fit_size(src_w, src_h, config.WIDTH, config.HEIGHT)
+        # Analysis frame: segmentation, flow and trail fields
+        self.aw, self.ah = analysis_size(self.w, self.h)
         self.mp_seg = mp.solutions.selfie_segmentation.SelfieSegmentation(model_selection=1)
 
         try:
@@ -16,40 +91,52 @@ class VisualEngine:
             self.dis = None
 
         self.prev_gray = None
-        self.canvas = np.zeros((self.h, self.w, 2), dtype=np.float32)
-        self.morph_kernel = np.ones((5, 5), np.uint8)
-        self.pi_180 = 180.0 / np.pi
-        self.hsv_scale = self.pi_180 / 2
+        self.canvas = np.zeros((self.ah, self.aw, 2), dtype=np.float32)
+        k = max(3, int(round(5 * np.sqrt(self.aw * self.ah / config.REFERENCE_PIXELS))) | 1)
+        self.morph_kernel = np.ones((k, k), np.uint8)
+        self.blur_size = (k, k)
+        # Flow is measured in analysis pixels; express it in reference-frame
+        # pixels so magnitudes do not depend on the analysis size. When only
+        # every frame_step-th source frame is analysed, flow also spans
+        # frame_step intervals: scale it back to per-frame units and retune the
+        # trail so it decays and saturates at the same rate in real time.
+        self.flow_scale = np.sqrt(config.REFERENCE_PIXELS / (self.aw * self.ah)) / frame_step
+        self.trail_decay = config.TRAIL_DECAY ** frame_step
+        self.trail_speed = config.TRAIL_SPEED * (1.0 - self.trail_decay) / (1.0 - config.TRAIL_DECAY)
+        self.trails = TrailRenderer((self.aw, self.ah), (self.w, self.h))
 
     def process(self, frame, mirror_mode=True):
-        frame = cv2.resize(frame, (self.w, self.h))
+        fh, fw = frame.shape[:2]
+        interp = cv2.INTER_AREA if fw > self.w else cv2.INTER_LINEAR
+        frame = cv2.resize(frame, (self.w, self.h), interpolation=interp)
 
         if mirror_mode:
             frame = cv2.flip(frame, 1)
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(frame, (self.aw, self.ah), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
 
         res = self.mp_seg.process(rgb)
-        mask = np.zeros((self.h, self.w), dtype=np.float32)
+        mask = np.zeros((self.ah, self.aw), dtype=np.float32)
         cx, cy = 0.5, 0.5
 
         if res.segmentation_mask is not None:
             bin_mask = (res.segmentation_mask > 0.5).astype(np.uint8)
             bin_mask = cv2.morphologyEx(bin_mask, cv2.MORPH_OPEN, self.morph_kernel)
             bin_mask = cv2.morphologyEx(bin_mask, cv2.MORPH_CLOSE, self.morph_kernel)
-            mask = cv2.GaussianBlur(bin_mask.astype(np.float32), (5, 5), 0)
+            mask = cv2.GaussianBlur(bin_mask.astype(np.float32), self.blur_size, 0)
 
             M = cv2.moments(bin_mask)
             if M["m00"] != 0:
-                cx = (M["m10"] / M["m00"]) / self.w
-                cy = (M["m01"] / M["m00"]) / self.h
+                cx = (M["m10"] / M["m00"]) / self.aw
+                cy = (M["m01"] / M["m00"]) / self.ah
 
         if self.prev_gray is None:
             self.prev_gray = gray
             c_mag = np.zeros_like(mask)
             c_ang = np.zeros_like(mask)
-            return frame, np.zeros((self.h, self.w)), c_ang, c_mag, cx, cy
+            return frame, np.zeros((self.ah, self.aw)), c_ang, c_mag, cx, cy
         if self.dis:
             flow = self.dis.calc(self.prev_gray, gray, None)
         else:
@@ -58,6 +145,7 @@ class VisualEngine:
                 0.5, 3, 15, 3, 5, 1.2, 0
             )
 
+        mask *= self.flow_scale
         flow[..., 0] *= mask
         flow[..., 1] *= mask
 
@@ -66,20 +154,12 @@ class VisualEngine:
         x_flow, y_flow = cv2.polarToCart(mag, ang)
 
         self.canvas = cv2.addWeighted(
-            np.dstack((x_flow, y_flow)), config.TRAIL_SPEED,
-            self.canvas, config.TRAIL_DECAY, 0
+            np.dstack((x_flow, y_flow)), self.trail_speed,
+            self.canvas, self.trail_decay, 0
         )
 
         c_mag, c_ang = cv2.cartToPolar(self.canvas[..., 0], self.canvas[..., 1])
-        hsv = np.zeros((self.h, self.w, 3), dtype=np.uint8)
-        hsv[..., 0] = (c_ang * self.hsv_scale).astype(np.uint8)
-        hsv[..., 1] = 255
-        hsv[..., 2] = np.clip(c_mag * 10, 0, 255).astype(np.uint8)
-
-        final = cv2.add(
-            (frame * 0.6).astype(np.uint8),
-            cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-        )
+        final = self.trails.render(frame, c_ang, c_mag)
 
         self.prev_gray = gray
         return final, mag, c_ang, c_mag, cx, cy
@@ -0,0 +1,30 @@
+# gunicorn.conf.py
+# gunicorn app:app -c gunicorn.conf.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import config  # noqa: E402
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = 600
+
+# Live sessions are held in the memory of the worker that started them, so
+# every request of a session must reach that process, and each MJPEG stream
+# occupies a thread for the whole session.
+if config.LIVE_ENABLED:
+    workers = 1
+    worker_class = "gthread"
+    threads = max(threads, config.LIVE_THREADS)
+
+# Heavy imports and the pose model are paid once in the master and shared
+# with workers copy-on-write. preload() builds no MediaPipe graphs, which
+# are not fork-safe; each job creates its own inside the worker.
+preload_app = True
+
+
+def on_starting(server):
+    from app import preload
+    preload()
@@ -1,7 +1,7 @@
 import cv2
 import os
 import config
-from engine.visuals import VisualEngine
+from engine.visuals import VisualEngine, analysis_step
 from engine.pose import PoseEngine
 from engine.data import DataCollector
 from engine.audio import AudioEngine
@@ -20,28 +20,39 @@ def main():
         return
 
     fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-    delay_time = int(1000 / fps) if is_video_file else 1
+    # Video files above ANALYSIS_FPS skip decoding the frames between steps
+    step = analysis_step(fps) if is_video_file else 1
+    delay_time = int(1000 * step / fps) if is_video_file else 1
     should_mirror = not is_video_file
 
+    src_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    visuals = VisualEngine(frame_step=step, frame_size=src_size if all(src_size) else None)
+
     temp_video_path = "temp_video.avi"
-    write_fps = fps if is_video_file else 30.0
+    write_fps = fps / step if is_video_file else 30.0
     writer = cv2.VideoWriter(
         temp_video_path,
         cv2.VideoWriter_fourcc(*'MJPG'),
         write_fps,
-        (config.WIDTH, config.HEIGHT)
+        (visuals.w, visuals.h)
     )
 
-    visuals = VisualEngine()
     pose_tracker = PoseEngine()
     collector = DataCollector()
     audio_synth = AudioEngine()
     show_skeleton = config.SHOW_SKELETON
 
     frame_idx = 0
+    src_idx = 0
     fps_inv = 1.0 / fps
 
     while True:
+        if src_idx % step:
+            if not cap.grab():
+                break
+            src_idx += 1
+            continue
+
         ret, frame = cap.read()
         if not ret:
             break
@@ -49,7 +60,7 @@ def main():
         visual_frame, flow_mag, c_ang, c_mag, cx, cy = visuals.process(frame, mirror_mode=should_mirror)
 
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        pose_result = pose_tracker.process(rgb, frame_idx * fps_inv * 1000.0)
+        pose_result = pose_tracker.process(rgb, src_idx * fps_inv * 1000.0)
 
         collector.process(flow_mag, c_ang, c_mag, cx, cy, pose_result)
 
@@ -59,6 +70,7 @@ def main():
         writer.write(final_output)
 
         frame_idx += 1
+        src_idx += 1
         if cv2.waitKey(delay_time) == ord('q'):
             break
 
@@ -69,15 +81,14 @@ def main():
     if not collector.spectral_hist:
         return
 
-    total_duration = frame_idx * fps_inv
-    wav_path = audio_synth.generate(collector, total_duration)
+    total_duration = frame_idx / write_fps
+    audio, _ = audio_synth.generate(collector, total_duration)
 
     output_filename = "final_performance.mp4"
-    audio_synth.merge_video(temp_video_path, wav_path, output_filename, total_duration)
+    audio_synth.merge_video(temp_video_path, audio, output_filename, total_duration)
 
     try:
         os.remove(temp_video_path)
-        os.remove(wav_path)
     except:
         pass
 
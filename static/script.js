@@ -168,6 +168,11 @@ function switchOption(option) {
     }
 }
 
+function formatDuration(seconds) {
+    const s = Math.round(seconds);
+    return `${Math.floor(s / 60)}:${String(s % 60).padStart(2, '0')}`;
+}
+
 // Load sample videos
 async function loadSamples() {
     const samplesGrid = document.getElementById('samples-grid');
@@ -190,10 +195,10 @@ async function loadSamples() {
                 const card = document.createElement('div');
                 card.className = 'sample-card';
                 card.innerHTML = `
-                    <div class="sample-card-title">${sample.name}</div>
+                    <div class="sample-card-title">${sample.name}${sample.duration ? ` · ${formatDuration(sample.duration)}` : ''}</div>
                     <div class="sample-card-preview">
-                        <video preload="metadata" muted>
-                            <source src="/sample_preview/${encodeURIComponent(sample.filename)}" type="video/mp4">
+                        <video preload="none" muted loop playsinline poster="${sample.thumbnail_url}">
+                            <source src="${sample.preview_url}" type="video/mp4">
                         </video>
                     </div>
                     <button class="sample-card-btn" onclick="processSample('${sample.filename}')">
@@ -0,0 +1,58 @@
+# tests/test_admission.py
+import multiprocessing
+import os
+import threading
+import pytest
+import config
+from engine import admission
+
+
+def hold_lock_and_die(ready):
+    admission._lock.__enter__()
+    ready.set()
+    os._exit(1)
+
+
+def test_lock_released_when_holder_dies():
+    ctx = multiprocessing.get_context('fork')
+    ready = ctx.Event()
+    proc = ctx.Process(target=hold_lock_and_die, args=(ready,))
+    proc.start()
+    assert ready.wait(10)
+    proc.join(10)
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (admission.load(), done.set()), daemon=True).start()
+    assert done.wait(5), "admission lock still held by a dead worker"
+
+
+def test_lock_excludes_threads():
+    inside = []
+    overlap = []
+
+    def work():
+        for _ in range(200):
+            with admission._lock:
+                inside.append(1)
+                overlap.append(len(inside))
+                inside.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(overlap) == 1
+
+
+def test_admit_reserves_and_releases(monkeypatch):
+    monkeypatch.setattr(config, 'ADMISSION_MEMORY_MB', 1000)
+    with admission.admit((1.0, 100.0), timeout=1):
+        assert admission.load()['running'] == 1
+        assert admission.load()['memory_mb'] == 100
+    assert admission.load()['running'] == 0
+
+    with pytest.raises(admission.Overloaded) as e:
+        with admission.admit((1.0, 2000.0), timeout=1):
+            pass
+    assert e.value.retry_after is None
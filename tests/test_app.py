@@ -0,0 +1,91 @@
+# tests/test_app.py
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import pytest
+import config
+import app as app_module
+import engine.live
+
+
+class SlowSession:
+    # Stand-in for LiveSession whose construction takes long enough for
+    # concurrent starts to overlap
+    fail = False
+
+    def __init__(self, session_id, video_path, mirror=True):
+        time.sleep(0.2)
+        if SlowSession.fail:
+            raise RuntimeError("no camera")
+        self.session_id = session_id
+        self.video_path = video_path
+        self.last_seen = time.monotonic()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def live(monkeypatch, tmp_path):
+    model = tmp_path / "pose.task"
+    model.write_bytes(b"x")
+    monkeypatch.setattr(config, 'POSE_MODEL_PATH', str(model))
+    monkeypatch.setattr(config, 'LIVE_MAX_SESSIONS', 2)
+    monkeypatch.setattr(engine.live, 'LiveSession', SlowSession)
+    monkeypatch.setattr(app_module, 'live_sessions', {})
+    monkeypatch.setattr(app_module, 'live_pending', 0)
+    app_module.app.config['TESTING'] = False
+    return app_module.app.test_client()
+
+
+def test_concurrent_starts_respect_session_cap(live):
+    codes = []
+    threads = [threading.Thread(target=lambda: codes.append(live.post('/live/start').status_code))
+               for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(codes) == [200, 200, 503, 503, 503, 503]
+    assert len(app_module.live_sessions) == 2
+    assert app_module.live_pending == 0
+
+
+def test_failed_start_releases_its_slot(live, monkeypatch):
+    monkeypatch.setattr(SlowSession, 'fail', True)
+    assert live.post('/live/start').status_code == 500
+    assert app_module.live_pending == 0
+    monkeypatch.setattr(SlowSession, 'fail', False)
+    assert live.post('/live/start').status_code == 200
+
+
+def test_app_starts_without_posix_modules():
+    # As on Windows: no fcntl, os.register_at_fork or os.sysconf. Run in a
+    # fresh interpreter so the real modules are not already imported.
+    code = textwrap.dedent("""
+        import os, sys
+        sys.modules['fcntl'] = None
+        del os.register_at_fork, os.sysconf
+        import config
+        config.ADMISSION_MEMORY_MB = 1000
+        import app
+        from engine import admission, samples
+        assert samples.fcntl is None and admission.fcntl is None
+        health = app.app.test_client().get('/healthz').get_json()
+        assert health['load']['memory_budget_mb'] == 1000
+        with admission.admit((1.0, 100.0), timeout=1):
+            assert admission.load()['running'] == 1
+        config.ADMISSION_MEMORY_MB = None
+        try:
+            admission.memory_budget_mb()
+        except RuntimeError as e:
+            assert 'ADMISSION_MEMORY_MB' in str(e)
+        else:
+            raise AssertionError('expected RuntimeError')
+    """)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
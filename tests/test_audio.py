@@ -0,0 +1,75 @@
+# tests/test_audio.py
+import os
+from collections import namedtuple
+import numpy as np
+import pytest
+import config
+from engine.audio import MODES, AudioEngine
+from engine.data import DataCollector
+
+Landmark = namedtuple('Landmark', 'x y')
+
+
+class PoseResult:
+    def __init__(self, people):
+        self.pose_landmarks = people
+
+
+def make_collector(n_frames, seed=0):
+    rng = np.random.default_rng(seed)
+    collector = DataCollector()
+    for _ in range(n_frames):
+        mag = (rng.random((24, 32)) * 20).astype(np.float32)
+        ang = (rng.random((24, 32)) * 2 * np.pi).astype(np.float32)
+        people = [[Landmark(*rng.random(2)) for _ in range(33)]]
+        collector.process(mag, ang, mag, rng.random(), rng.random(), PoseResult(people))
+    return collector
+
+
+def test_block_shaping_matches_whole_session(monkeypatch):
+    collector = make_collector(70)
+    engine = AudioEngine()
+    args = (collector.spectral_hist, collector.mod_hist, collector.pose_hist)
+
+    monkeypatch.setattr(config, 'GL_BLOCK_FRAMES', 1000)
+    whole = np.array(engine._shape_spectrogram(*args))
+    monkeypatch.setattr(config, 'GL_BLOCK_FRAMES', 16)
+    blocks = engine._shape_spectrogram(*args)
+
+    assert isinstance(blocks, np.memmap)
+    np.testing.assert_allclose(np.asarray(blocks), whole, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("fps", [10, 15, 24, 29.97, 30, 60])
+def test_reconstruction_fills_video_duration(monkeypatch, fps):
+    monkeypatch.setattr(config, 'GL_N_ITER', 2)
+    monkeypatch.setattr(config, 'GL_BLOCK_FRAMES', 64)
+    n_frames = int(round(fps * 4))
+    total_time = n_frames / fps
+    engine = AudioEngine()
+    S = np.random.default_rng(0).random((engine.n_bins, n_frames), dtype=np.float32)
+
+    hop, n_cols = engine._frame_hop(n_frames, total_time)
+    assert hop <= config.N_FFT // 4
+    assert abs(n_cols * hop - total_time * engine.sr) <= hop / 2
+
+    audio = engine._reconstruct(S, total_time)
+    assert len(audio) == int(round(total_time * engine.sr))
+    assert audio.dtype == np.float32
+    assert np.all(np.isfinite(audio))
+
+
+def test_all_modes_written_to_track_paths(monkeypatch, tmp_path):
+    # Output folders may contain format braces; paths come from a callable
+    monkeypatch.setattr(config, 'GL_N_ITER', 2)
+    folder = tmp_path / "out{id}"
+    folder.mkdir()
+    engine = AudioEngine()
+    paths, audio = engine.generate_all_modes(
+        make_collector(30), 1.0, lambda mode: str(folder / f"mode_{mode}.wav")
+    )
+    assert sorted(paths) == sorted(MODES)
+    for mode, path in paths.items():
+        assert path == str(folder / f"mode_{mode}.wav")
+        assert os.path.exists(path)
+    assert audio is not None and len(audio) == engine.sr
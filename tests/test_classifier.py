@@ -0,0 +1,133 @@
+# tests/test_classifier.py
+import math
+from collections import namedtuple
+import numpy as np
+import pytest
+import config
+from engine.data import DataCollector
+
+Landmark = namedtuple('Landmark', 'x y')
+ANG = np.zeros((24, 32), np.float32)
+
+
+class PoseResult:
+    def __init__(self, people):
+        self.pose_landmarks = people
+
+
+def reference_mode(motion_hist, pose_hist):
+    # The whole-history scan ModeClassifier replaced
+    if not len(motion_hist):
+        return "ambient", 0.0, 0.3
+    m = np.array(motion_hist, dtype=np.float32)
+    high_ratio, low_ratio = np.mean(m > 0.6), np.mean(m < 0.2)
+
+    spreads, torso_deltas, paired_deltas = [], [], []
+    prev = None
+    for frame in pose_hist:
+        if not frame:
+            continue
+        arr = np.array(frame)
+        spreads.extend(np.abs(np.clip(arr[:, 2], 0, 1) - np.clip(arr[:, 0], 0, 1)).tolist())
+        cur = sorted([(f[5], f[4]) for f in frame], key=lambda x: x[0])
+        if prev:
+            count = min(len(prev), len(cur))
+            deltas = np.abs(np.array([c[1] for c in cur[:count]]) - np.array([p[1] for p in prev[:count]]))
+            torso_deltas.append(float(np.mean(deltas)))
+            if len(prev) == len(cur):
+                paired_deltas.append(float(np.mean(deltas)))
+        prev = cur
+
+    torso = np.mean(torso_deltas) if torso_deltas else 0.0
+    spread = np.mean(spreads) if spreads else 0.3
+    if high_ratio > 0.4 and np.var(m) > 0.02:
+        mode = "fm" if (torso > 0.03 and spread > 0.4) else "rhythmic"
+    elif spread > 0.5:
+        mode = "granular"
+    else:
+        mode = "ambient"
+    return mode, (np.mean(paired_deltas) if paired_deltas else 0.0), spread
+
+
+def person(lw, rw, ls, rs):
+    lm = [Landmark(0.5, 0.5)] * 33
+    lm[15], lm[16], lm[11], lm[12] = Landmark(*lw), Landmark(*rw), Landmark(*ls), Landmark(*rs)
+    return lm
+
+
+def test_matches_reference_scan():
+    rng = np.random.default_rng(1)
+    modes = set()
+    for _ in range(40):
+        c = DataCollector()
+        speed, spread, jitter = rng.uniform(0, 1.2), rng.uniform(0, 0.9), rng.uniform(0, 0.2)
+        for _ in range(rng.integers(1, 150)):
+            mag = np.full((24, 32), abs(rng.normal(speed, speed * 0.8)) * 10, np.float32)
+            people = [person((0.5 - spread / 2 + rng.normal(0, .05), rng.uniform(0, 1)),
+                             (0.5 + spread / 2, rng.uniform(0, 1)),
+                             (0.45 + rng.normal(0, jitter), 0.4),
+                             (0.55, 0.4 + rng.normal(0, jitter))) for _ in range(rng.integers(0, 3))]
+            c.process(mag, ANG, mag, 0.5, 0.5, PoseResult(people) if people else None)
+
+        mode, torso_act, avg_spread = reference_mode(c.motion_hist, c.pose_hist)
+        modes.add(mode)
+        assert c.session_mode() == mode
+        assert c.classifier.torso_act == pytest.approx(torso_act, abs=1e-6)
+        assert c.classifier.avg_spread == pytest.approx(avg_spread, abs=1e-6)
+    assert modes >= {"ambient", "fm", "granular", "rhythmic"}
+
+
+def idle(i):
+    return 0.0, person((0.4, 0.7), (0.6, 0.7), (0.42, 0.4), (0.58, 0.4))
+
+
+def raise_arms(i):
+    return 0.3, person((0.4, 0.2), (0.6, 0.2), (0.42, 0.4), (0.58, 0.4))
+
+
+def wave(i):
+    return 0.3, person((0.4, 0.7), (0.6 + 0.08 * math.sin(i / 3), 0.25), (0.42, 0.4), (0.58, 0.4))
+
+
+def spin(i):
+    w = 0.08 * math.cos(i / 15 * math.pi)
+    return 0.3, person((0.5 - w, 0.7), (0.5 + w, 0.7), (0.5 - w, 0.4), (0.5 + w, 0.401))
+
+
+def jump(i):
+    dy = -0.15 * max(0, math.sin(i / 8 * math.pi)) if (i // 8) % 2 == 0 else 0
+    return 0.3, person((0.4, 0.7 + dy), (0.6, 0.7 + dy), (0.42, 0.4 + dy), (0.58, 0.4 + dy))
+
+
+def run(script, n=90):
+    c = DataCollector()
+    seen = {}
+    for i in range(n):
+        energy, lm = script(i)
+        mag = np.full((24, 32), energy * 10, np.float32)
+        c.process(mag, ANG, mag, 0.5, 0.5, PoseResult([lm]))
+        seen[c.current_gesture] = seen.get(c.current_gesture, 0) + 1
+    return c, seen
+
+
+@pytest.mark.parametrize("script,gesture,mode", [
+    (idle, "stillness", "ambient"),
+    (raise_arms, "raise_arms", "harmonic"),
+    (wave, "wave", "granular"),
+    (spin, "spin", "doppler_fm"),
+    (jump, "jump", "rhythmic"),
+])
+def test_scripted_gestures(monkeypatch, script, gesture, mode):
+    c, seen = run(script)
+    assert max(seen, key=seen.get) == gesture
+    assert c.gestures.dominant() == gesture
+    # Detected and reported, but the statistics pick the mode by default
+    assert c.session_mode() == c.classifier.mode()
+    monkeypatch.setattr(config, 'GESTURE_MODE_OVERRIDE', True)
+    assert c.session_mode() == mode
+
+
+def test_no_gesture_without_motion_patterns():
+    c, seen = run(lambda i: (0.3 + 0.1 * math.sin(i), idle(i)[1]))
+    assert set(seen) == {None}
+    assert c.gestures.dominant() is None
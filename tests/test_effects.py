@@ -0,0 +1,81 @@
+# tests/test_effects.py
+import numpy as np
+import pytest
+import scipy.ndimage
+from engine import effects
+
+SR = 22050
+
+
+def reference_gate(audio, motion_curve, sr):
+    # The loop-based gate effects.rhythmic_gate replaced
+    m_smooth = scipy.ndimage.gaussian_filter1d(motion_curve, sigma=max(1, len(motion_curve) // 200))
+    threshold = np.mean(m_smooth) + 0.5 * np.std(m_smooth)
+    peaks = np.where(
+        (m_smooth[1:-1] > m_smooth[:-2]) &
+        (m_smooth[1:-1] > m_smooth[2:]) &
+        (m_smooth[1:-1] > threshold)
+    )[0] + 1
+    env = np.full(len(audio), 0.15, dtype=np.float32)
+    width = int(0.06 * sr)
+    for p in peaks:
+        center = int(p * len(audio) / len(motion_curve))
+        indices = np.arange(max(0, center - width), min(len(audio), center + width))
+        env[indices] = np.maximum(env[indices], 1.0 - np.abs(indices - center) / width)
+    return audio * env
+
+
+@pytest.fixture
+def audio():
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(SR * 3) * 0.3).astype(np.float32)
+
+
+@pytest.mark.parametrize("length", ["frames", "samples"])
+def test_gate_matches_reference(audio, length):
+    # Frame-rate curves take gaussian_filter1d; audio-rate curves (as the
+    # synthesis modes pass them) take the FFT path
+    rng = np.random.default_rng(1)
+    n = 90 if length == "frames" else len(audio)
+    t = np.linspace(0, 12, n)
+    motion = np.clip(np.abs(np.sin(t)) + rng.normal(0, 0.05, n), 0, 1)
+    expected = reference_gate(audio, motion, SR)
+    np.testing.assert_allclose(effects.rhythmic_gate(audio, motion, SR), expected, atol=1e-6)
+
+
+def test_gate_keeps_broad_peaks(audio):
+    # An audio-rate curve with a broad bump is flat to the last bit at its
+    # top in float32, where no sample passes the strict peak test
+    n = len(audio)
+    motion = np.exp(-0.5 * ((np.arange(n) - n / 2) / (n / 3.3)) ** 2)
+    out = effects.rhythmic_gate(audio, motion, SR)
+    assert np.max(np.abs(out)) > 0.5 * np.max(np.abs(audio))
+
+
+@pytest.mark.parametrize("fn", [
+    lambda a, **kw: effects.reverb(a, SR, **kw),
+    lambda a, **kw: effects.rhythmic_gate(a, np.abs(np.sin(np.linspace(0, 9, 90))), SR, **kw),
+])
+def test_new_array_unless_out(audio, fn):
+    original = audio.copy()
+    out = fn(audio)
+    assert out is not audio
+    np.testing.assert_array_equal(audio, original)
+
+    in_place = fn(audio, out=audio)
+    assert in_place is audio
+    np.testing.assert_array_equal(in_place, out)
+
+
+def test_granular_never_aliases_input():
+    short = np.ones(100, dtype=np.float32)
+    out = effects.granular(short, SR)
+    out *= 0
+    assert short.sum() == 100
+
+
+def test_granular_is_normalized(audio):
+    out = effects.granular(audio, SR, rng=np.random.default_rng(0))
+    assert out.shape == audio.shape
+    assert out.dtype == np.float32
+    assert np.max(np.abs(out)) == pytest.approx(0.9, abs=1e-4)
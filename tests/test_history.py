@@ -0,0 +1,82 @@
+# tests/test_history.py
+import numpy as np
+import pytest
+import config
+from engine.history import SpillHistory, PoseHistory
+
+WINDOW = 50
+N = 3 * WINDOW + 17  # three spills plus a partly filled hot buffer
+
+
+@pytest.fixture
+def rows():
+    return np.random.default_rng(0).random((N, 3)).astype(np.float32)
+
+
+@pytest.fixture
+def history(rows):
+    h = SpillHistory((3,), window=WINDOW)
+    for row in rows:
+        h.append(row)
+    return h
+
+
+def test_spills_to_cold_storage(history):
+    assert len(history) == N
+    assert history._n_cold == 3 * WINDOW
+    assert isinstance(history._cold(), np.memmap)
+
+
+@pytest.mark.parametrize("idx", [0, WINDOW - 1, WINDOW, 2 * WINDOW + 3, N - 1, -1, -WINDOW, -N])
+def test_int_indexing(history, rows, idx):
+    np.testing.assert_array_equal(history[idx], rows[idx])
+
+
+@pytest.mark.parametrize("idx", [N, -N - 1])
+def test_index_out_of_range(history, idx):
+    with pytest.raises(IndexError):
+        history[idx]
+
+
+@pytest.mark.parametrize("key", [
+    slice(None), slice(10, 40), slice(WINDOW - 5, WINDOW + 5), slice(20, N - 3),
+    slice(3 * WINDOW, None), slice(-30, None), slice(-70, -10), slice(40, 10),
+    slice(None, None, 7), slice(5, N - 5, 3), slice(None, None, -1), slice(N, 0, -13),
+])
+def test_slicing(history, rows, key):
+    np.testing.assert_array_equal(history[key], rows[key])
+
+
+def test_iter_and_asarray(history, rows):
+    np.testing.assert_array_equal(np.array(list(history)), rows)
+    np.testing.assert_array_equal(np.asarray(history), rows)
+    assert np.asarray(history, dtype=np.float64).dtype == np.float64
+
+
+def test_hot_rows_survive_later_spills(rows):
+    h = SpillHistory((3,), window=WINDOW)
+    for row in rows[:WINDOW]:
+        h.append(row)
+    tail = h[WINDOW - 10:]
+    for row in rows[WINDOW:]:
+        h.append(row)
+    np.testing.assert_array_equal(tail, rows[WINDOW - 10:WINDOW])
+
+
+def test_pose_history_round_trip():
+    rng = np.random.default_rng(1)
+    frames = []
+    for _ in range(N):
+        people = rng.integers(0, config.MAX_PEOPLE + 2)
+        frames.append([tuple(float(np.float32(v)) for v in rng.random(6)) for _ in range(people)])
+    h = PoseHistory(window=WINDOW)
+    for frame in frames:
+        h.append(frame)
+
+    expected = [f[:config.MAX_PEOPLE] for f in frames]
+    assert h._n_cold == 3 * WINDOW
+    assert list(h) == expected
+    assert h[7] == expected[7] and h[-1] == expected[-1]
+    assert h[WINDOW - 3:2 * WINDOW + 4] == expected[WINDOW - 3:2 * WINDOW + 4]
+    assert h[::9] == expected[::9]
+    assert [] in expected
@@ -0,0 +1,82 @@
+# tests/test_oscillators.py
+import numpy as np
+import pytest
+from engine import oscillators
+from engine.audio import AudioEngine
+
+SR = 22050
+
+
+def reference_fm(sr, n, freq, index, ratio=2.0):
+    # Full-length float64 FM with integrated phase; freq and index are
+    # per-sample arrays
+    rad = 2.0 * np.pi / sr
+    pc = np.concatenate(([0.0], np.cumsum(freq * rad)[:-1]))
+    y = np.sin(pc + index * np.sin(pc * ratio)) * np.hanning(n)
+    peak = np.max(np.abs(y))
+    return y / (peak + 1e-6) * 0.9
+
+
+def blocks(fn, n, block):
+    return np.concatenate([fn(s, min(n, s + block)) for s in range(0, n, block)])
+
+
+@pytest.mark.parametrize("n,length", [(SR * 2, 90), (SR * 2, SR * 2), (1000, 7)])
+def test_control_matches_interp(n, length):
+    curve = np.random.default_rng(0).random(length)
+    expected = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, length), curve)
+    got = blocks(lambda s, e: oscillators.control(curve, s, e, n), n, 3001)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("n", [1, 2, 1000, SR * 3])
+def test_hann_matches_numpy(n):
+    got = blocks(lambda s, e: oscillators.hann(s, e, n), n, 4096)
+    np.testing.assert_allclose(got, np.hanning(n), atol=1e-6)
+
+
+def test_wrap_keeps_phase():
+    x = np.random.default_rng(0).random(10000) * 1e6
+    w = oscillators.wrap(x)
+    assert w.dtype == np.float32
+    assert np.all((w >= 0) & (w <= 2 * np.pi + 1e-6))
+    np.testing.assert_allclose(np.sin(w), np.sin(x), atol=1e-5)
+
+
+@pytest.mark.parametrize("block", [oscillators.BLOCK, 1000])
+def test_fm_matches_float64_reference(block):
+    n = SR * 4
+    curve = np.abs(np.sin(np.linspace(0, 7, 120)))
+    depth = 3.5
+    freq = 220.0 * (1.0 + 0.3 * np.sin(2 * np.pi * 0.5 * np.arange(n) / SR))
+    index = depth * np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(curve)), curve)
+    expected = reference_fm(SR, n, freq, index)
+
+    out = np.empty(n, dtype=np.float32)
+    out, peak = oscillators.fm(
+        out, SR, lambda s, e: freq[s:e], lambda s, e: oscillators.control(curve, s, e, n) * np.float32(depth),
+        block=block
+    )
+    got = oscillators.normalize(out, peak)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+
+
+def test_fm_synth_matches_original():
+    # The original constant-carrier fm_synth, which the block version must
+    # reproduce: same carrier, modulator, index curve and window
+    engine = AudioEngine()
+    scale = [110.0, 220.0, 330.0]
+    curve = np.abs(np.sin(np.linspace(0, 5, 60)))
+    duration, torso, spread = 3.0, 0.02, 0.4
+    n = int(duration * SR)
+    t = np.linspace(0.0, duration, n, endpoint=False)
+    m = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(curve)), curve)
+    index = 2.0 * m * (1.0 + min(torso * 50, 4.0)) * (1.0 + spread)
+    y = np.sin(2 * np.pi * 220.0 * t + index * np.sin(2 * np.pi * 440.0 * t)) * np.hanning(n)
+    expected = y / (np.max(np.abs(y)) + 1e-6) * 0.9
+
+    got = engine._fm_synth(duration, scale, curve, torso, spread)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, atol=1e-5)
@@ -0,0 +1,90 @@
+# tests/test_samples.py
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from engine import samples as samples_module
+from engine.samples import SampleCatalog, WARM_LOCK
+
+
+def make_video(path, n=5):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10.0, (64, 48))
+    for i in range(n):
+        writer.write(np.full((48, 64, 3), 12 * i, np.uint8))
+    writer.release()
+
+
+def test_concurrent_warms_build_each_asset_once(tmp_path, monkeypatch):
+    # Two catalogs over one cache stand in for two gunicorn workers
+    samples, cache = tmp_path / "Samples", tmp_path / "cache"
+    samples.mkdir()
+    for name in ("a.avi", "b.avi"):
+        make_video(samples / name)
+    cache.mkdir()
+    (cache / "stale.jpg").write_bytes(b"x")
+
+    built = []
+
+    def build(src, dst):
+        built.append(dst)
+        time.sleep(0.05)
+        with open(dst, 'wb') as f:
+            f.write(b"asset")
+
+    monkeypatch.setattr(SampleCatalog, '_build_thumbnail', lambda self, src, dst: build(src, dst))
+    monkeypatch.setattr(SampleCatalog, '_build_preview', lambda self, src, dst: build(src, dst))
+    monkeypatch.setattr('config.SAMPLE_PRECOMPUTE', False)
+
+    catalogs = [SampleCatalog(samples, cache) for _ in range(2)]
+    for catalog in catalogs:
+        assert len(catalog.list()) == 2
+    threads = [threading.Thread(target=c.warm) for c in catalogs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 4
+    assert sorted(p.name for p in cache.iterdir() if p.name != WARM_LOCK) == sorted(
+        f"{e['key']}{suffix}" for e in catalogs[0].list() for suffix in ('.jpg', '.mp4')
+    )
+
+
+def test_warm_without_fcntl(tmp_path, monkeypatch):
+    samples, cache = tmp_path / "Samples", tmp_path / "cache"
+    samples.mkdir()
+    make_video(samples / "a.avi")
+    monkeypatch.setattr(samples_module, 'fcntl', None)
+    monkeypatch.setattr('config.SAMPLE_PRECOMPUTE', False)
+    monkeypatch.setattr(SampleCatalog, '_build_thumbnail', lambda self, src, dst: open(dst, 'wb').close())
+    monkeypatch.setattr(SampleCatalog, '_build_preview', lambda self, src, dst: open(dst, 'wb').close())
+
+    catalog = SampleCatalog(samples, cache)
+    catalog.refresh()
+    catalog.warm()
+    key = catalog.list()[0]['key']
+    assert sorted(p.name for p in cache.iterdir()) == [f"{key}.jpg", f"{key}.mp4"]
+
+
+def test_overwritten_sample_is_rescanned(tmp_path, monkeypatch):
+    # Replacing a file's contents leaves the directory mtime unchanged
+    monkeypatch.setattr('config.SAMPLE_PRECOMPUTE', False)
+    samples = tmp_path / "Samples"
+    samples.mkdir()
+    make_video(samples / "dance.avi", n=5)
+    catalog = SampleCatalog(samples, tmp_path / "cache")
+    before = catalog.get("dance.avi")
+    assert before['duration'] == 0.5
+    assert not catalog.refresh()
+
+    dir_mtime = os.stat(samples).st_mtime_ns
+    replacement = tmp_path / "new.avi"
+    make_video(replacement, n=20)
+    with open(samples / "dance.avi", 'wb') as f:
+        f.write(replacement.read_bytes())
+    os.utime(samples, ns=(dir_mtime, dir_mtime))
+
+    after = catalog.get("dance.avi")
+    assert after['duration'] == 2.0
+    assert after['key'] != before['key']
@@ -0,0 +1,78 @@
+# tools/replay_live.py
+# Replay a video file against a running app as if it were a browser webcam:
+#   python app.py
+#   python tools/replay_live.py Samples/dance.mp4 [--url http://localhost:5000] [--fast]
+# Frames are JPEG-encoded and POSTed over one kept-alive connection with
+# their media timestamps, paced to real time unless --fast is given.
+import argparse
+import json
+import time
+import http.client
+from urllib.parse import urlparse
+import cv2
+
+
+def request(conn, method, path, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    resp = conn.getresponse()
+    data = resp.read()
+    try:
+        payload = json.loads(data) if data else {}
+    except ValueError:
+        payload = {'raw': data[:200]}
+    return resp.status, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a video into a live session")
+    parser.add_argument('video')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--fast', action='store_true', help="send frames as fast as possible")
+    parser.add_argument('--quality', type=int, default=80)
+    args = parser.parse_args()
+
+    cap = cv2.VideoCapture(args.video)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {args.video}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    url = urlparse(args.url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=600)
+
+    status, session = request(conn, 'POST', '/live/start', json.dumps({'mirror': False}),
+                              {'Content-Type': 'application/json'})
+    if status != 200:
+        raise SystemExit(f"start failed ({status}): {session}")
+    print(f"session {session['session_id']}  stream: {args.url}{session['stream_url']}")
+
+    start = time.perf_counter()
+    sent = 0
+    stats = {}
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        ts_ms = sent * 1000.0 / fps
+        if not args.fast:
+            delay = start + ts_ms * 0.001 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, args.quality])
+        if not ok:
+            continue
+        status, stats = request(conn, 'POST', session['frame_url'], buf.tobytes(),
+                                {'Content-Type': 'image/jpeg', 'X-Timestamp-Ms': f"{ts_ms:.3f}"})
+        if status != 200:
+            raise SystemExit(f"frame {sent} rejected ({status}): {stats}")
+        sent += 1
+    cap.release()
+
+    elapsed = time.perf_counter() - start
+    print(f"sent {sent} frames in {elapsed:.1f}s ({sent / max(elapsed, 1e-6):.1f} fps); last stats: {stats}")
+
+    status, result = request(conn, 'POST', f"/live/{session['session_id']}/stop")
+    print(f"stop ({status}): {json.dumps(result, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()